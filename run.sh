@@ -16,7 +16,7 @@ if [ -f "venv/bin/activate" ]; then
     echo "✅ Virtual environment activated"
     
     # Check if dependencies are installed (optional)
-    if ! python3 -c "import requests, yaml, bs4" &> /dev/null; then
+    if ! python3 -c "import aiohttp, yaml, orjson, msgspec" &> /dev/null; then
         echo "⚠️  Dependencies missing, installing..."
         pip install -r requirements.txt
     fi
@@ -4,67 +4,141 @@ Async Ashby HQ Job Scraper
 Scrape Forward Deployed Engineer related positions using aiohttp
 """
 
-import asyncio
-import json
 import re
+import json
+import os
+import asyncio
 import logging
 import aiohttp
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Optional
 from base_scraper import AsyncBaseScraper
 import config
-from models import JobSource
-from utils import log_scraper_start, with_error_handling
-from constants import URLTemplates, LogMessages, CompensationDefaults
+from models import Job, JobSource
+from utils import log_scraper_start, with_error_handling, run_async
+from constants import URLTemplates, LogMessages, CompensationDefaults, EmploymentTypeDefaults
 
 logger = logging.getLogger(__name__)
 
+# Resolved once - JobSource.value is an enum property lookup
+SOURCE_NAME = JobSource.ASHBY.value
+
+# Anchor for the appData assignment - a literal prefix, so the search is a linear scan
+APP_DATA_PREFIX_PATTERN = re.compile(rb'window\.__appData\s*=\s*(?=\{)')
+
+# raw_decode parses the object at an offset and stops at its closing brace
+_APP_DATA_DECODER = json.JSONDecoder()
+
+
+def parse_app_data(html_content: bytes) -> Dict:
+    """
+    Parse the window.__appData JSON object out of raw HTML bytes
+    
+    The object is decoded straight from its anchor in a single pass, so braces
+    and ';' inside string literals can't cut it short and it isn't scanned twice.
+    
+    Args:
+        html_content: Raw page bytes
+        
+    Returns:
+        The parsed appData object
+        
+    Raises:
+        ValueError: If window.__appData is missing or isn't valid JSON
+    """
+    match = APP_DATA_PREFIX_PATTERN.search(html_content)
+    if not match:
+        raise ValueError("window.__appData not found")
+    
+    text = html_content[match.end():].decode('utf-8', errors='replace')
+    try:
+        app_data, _ = _APP_DATA_DECODER.raw_decode(text)
+    except ValueError as e:
+        raise ValueError(f"JSON parsing failed: {e}") from None
+    return app_data
+
+
+def extract_job_postings(html_content: bytes) -> Optional[List[Dict]]:
+    """
+    Extract the job postings list from raw Ashby HTML bytes
+    
+    Module-level so it can be pickled and run in a worker process; only the
+    postings list is returned to keep the result cheap to send back. It doesn't
+    log - worker processes have no handler writing to the run log - so failures
+    are raised for the caller to report.
+    
+    Args:
+        html_content: Raw page bytes
+        
+    Returns:
+        List of job postings, or None if the page has no job board data
+        
+    Raises:
+        ValueError: If window.__appData is missing or isn't valid JSON
+    """
+    # Find and parse window.__appData = {...}
+    app_data = parse_app_data(html_content)
+    
+    if not app_data:
+        return None
+    
+    job_board = app_data.get('jobBoard') or {}
+    return job_board.get('jobPostings') or []
+
 
 class AsyncAshbyScraper(AsyncBaseScraper):
     def __init__(self, config_path: str = None, config_key: str = None):
         super().__init__(config_path or str(config.COMPANIES_CONFIG), config_key or 'ashby')
+        # Worker processes for large pages - started on the first one, kept until close
+        self._pool: Optional[ProcessPoolExecutor] = None
+    
+    async def close(self):
+        """Close the HTTP session and shut the parsing pool down"""
+        await super().close()
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            # shutdown(wait=True) blocks, so it runs in a thread rather than on the event loop
+            await asyncio.to_thread(pool.shutdown)
+    
+    async def _extract_job_postings(self, html_content: bytes, company_name: str) -> Optional[List[Dict]]:
+        """
+        Extract a page's job postings, logging why if it can't be read
         
-    def _extract_job_data(self, html_content: str) -> Optional[Dict]:
-        """Extract job data from HTML"""
-        # Find window.__appData = {...} 
-        pattern = r'window\.__appData\s*=\s*({.*?});'
-        match = re.search(pattern, html_content, re.DOTALL)
-        
-        if not match:
-            logger.error("window.__appData not found")
-            return None
-            
+        Pages of ASHBY_PROCESS_PARSE_MIN_BYTES or more are parsed in a worker
+        process when there's more than one CPU, so the event loop keeps serving
+        other companies' I/O; everything else is parsed inline.
+        """
+        cpu_count = os.cpu_count() or 1
         try:
-            # Parse JSON data
-            app_data = json.loads(match.group(1))
-            return app_data
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON parsing failed: {e}")
+            if len(html_content) < config.ASHBY_PROCESS_PARSE_MIN_BYTES or cpu_count < 2:
+                return extract_job_postings(html_content)
+            
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=cpu_count)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, extract_job_postings, html_content)
+        except ValueError as e:
+            logger.error("%s: %s", company_name, e)
             return None
     
     @with_error_handling(default_return=[])
-    async def scrape_company(self, session: aiohttp.ClientSession, company: Dict) -> List[Dict]:
+    async def scrape_company(self, session: aiohttp.ClientSession, company: Dict) -> List[Job]:
         """Scrape jobs from a single company asynchronously"""
         log_scraper_start(company['name'], 'Ashby', logger)
         
         # Generate URL from job_board_name
         url = company.get('url') or URLTemplates.ASHBY.format(job_board_name=company['job_board_name'])
         
-        async with session.get(url) as response:
-            if response.status != 200:
-                logger.error(LogMessages.HTTP_ERROR.format(status=response.status, company=company['name']))
-                return []
-            
-            html_content = await response.text()
+        html_content = await self.fetch_raw(session, url, company['name'])
+        if html_content is None:
+            return []
         
-        # Extract data
-        app_data = self._extract_job_data(html_content)
-        if not app_data:
+        # Extract job listings
+        job_postings = await self._extract_job_postings(html_content, company['name'])
+        if job_postings is None:
             logger.error(LogMessages.EXTRACTION_ERROR.format(company=company['name']))
             return []
         
-        # Get job listings
-        job_board = app_data.get('jobBoard', {}) if app_data else {}
-        job_postings = job_board.get('jobPostings', []) if job_board else []
         logger.info(LogMessages.FOUND_JOBS.format(count=len(job_postings), company=company['name']))
         
         # Filter recent jobs first (optimization to reduce processing time)
@@ -74,32 +148,32 @@ class AsyncAshbyScraper(AsyncBaseScraper):
         fde_jobs = self._filter_fde_jobs(recent_jobs)
         logger.info(LogMessages.FILTERED_JOBS.format(count=len(fde_jobs), company=company['name']))
         
-        # Format data
-        formatted_jobs = []
-        for job in fde_jobs:
-            # Create base job dict
-            formatted_job = self.create_job_dict(job, company, JobSource.ASHBY)
-            
-            # Override with Ashby-specific fields
-            if company.get('is_vc_portfolio', False):
-                formatted_job['company_name'] = job.get('departmentName', company['name'])
-            
-            formatted_job.update({
-                'role_name': job.get('title', ''),
-                'location': job.get('locationName', ''),
-                'job_link': URLTemplates.ASHBY_JOB.format(job_board_name=company['job_board_name'], job_id=job.get('id', '')),
-                'employment_type': job.get('employmentType', 'FullTime'),
-                'team': job.get('teamName', ''),
-                'published_date': job.get('publishedDate', ''),
-                'compensation': job.get('compensationTierSummary', CompensationDefaults.NOT_DISCLOSED),
-            })
-            
-            formatted_jobs.append(formatted_job)
+        # Filter US-only jobs on the location column first, then format only the survivors
+        locations = [job.get('locationName', '') for job in fde_jobs]
+        us_jobs, stats = await self.filter_and_collect_stats(fde_jobs, company['name'], locations)
         
-        # Filter US-only jobs and collect statistics
-        us_jobs, stats = await self.filter_and_collect_stats(formatted_jobs, company['name'])
-        return us_jobs
-
+        job_link_prefix = URLTemplates.ASHBY_JOB.format(job_board_name=company['job_board_name'], job_id='')
+        job_defaults = self.create_job_defaults(company, SOURCE_NAME)
+        return [self._format_job(job, company, job_defaults, job_link_prefix) for job in us_jobs]
+    
+    def _format_job(self, job: Dict, company: Dict, job_defaults: Dict, job_link_prefix: str) -> Job:
+        """Build the standardized job record from an Ashby job posting"""
+        # Override with Ashby-specific fields
+        extra_fields = {}
+        if company.get('is_vc_portfolio', False):
+            extra_fields['company_name'] = job.get('departmentName') or company['name']
+        
+        return self.create_job(
+            job, job_defaults,
+            role_name=job.get('title', ''),
+            location=self._intern(job.get('locationName')),
+            job_link=job_link_prefix + job.get('id', ''),
+            employment_type=self._intern(job.get('employmentType'), EmploymentTypeDefaults.FULL_TIME),
+            team=self._intern(job.get('teamName')),
+            published_date=job.get('publishedDate', ''),
+            compensation=self._intern(job.get('compensationTierSummary'), CompensationDefaults.NOT_DISCLOSED),
+            **extra_fields
+        )
 
 async def main():
     """Test the async Ashby scraper independently"""
@@ -112,14 +186,15 @@ async def main():
     
     # Scrape Ashby jobs
     scraper = AsyncAshbyScraper()
-    jobs = await scraper.scrape_all(max_concurrent=10)
+    async with scraper:
+        jobs = await scraper.scrape_all(max_concurrent=10)
     
     # Show results
     if jobs:
         print(f"\n✅ Async Ashby scraping completed! Found {len(jobs)} FDE related jobs")
         print("\nSample jobs:")
         for job in jobs[:5]:
-            print(f"  • {job['role_name']} at {job['company_name']} ({job['location']})")
+            print(f"  • {job.role_name} at {job.company_name} ({job.location})")
         if len(jobs) > 5:
             print(f"  ... and {len(jobs) - 5} more jobs")
     else:
@@ -127,4 +202,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run_async(main())
\ No newline at end of file
@@ -7,29 +7,107 @@ Common functionality for all async job scrapers using aiohttp
 import asyncio
 import aiohttp
 import logging
+import operator
+import re
+import sys
 import time
 from abc import ABC, abstractmethod
-from datetime import datetime, timedelta
+from datetime import datetime
+from functools import lru_cache
+from itertools import compress
 from pathlib import Path
-from typing import List, Dict, Tuple
-import yaml
+from typing import List, Dict, Optional, Tuple
 import config
-from location_filter import is_us_location
-from models import JobStats, JobSource
-from utils import log_job_statistics, log_scraper_start, with_error_handling
-from utils.logging_utils import EMOJI_SUCCESS, EMOJI_ERROR
-from constants import JobFields
+from location_filter import classify_us_locations
+from models import Job, JobStats
+from utils import log_job_statistics, months_ago, epoch_ms_to_date
+from constants import JobFields, EmploymentTypeDefaults, CompensationDefaults, LogMessages
+from yaml_cache import load_yaml
+
+__all__ = ['AsyncBaseScraper']
 
 logger = logging.getLogger(__name__)
 
 
+def _minimal_keywords(keywords: List[str]) -> List[str]:
+    """
+    Drop keywords that contain another keyword
+    
+    Any title matching 'forward deployed engineer' also matches 'forward deployed',
+    so only the shorter keyword needs to be searched for.
+    """
+    lowered = list(dict.fromkeys(keyword.lower() for keyword in keywords))
+    return [
+        keyword for keyword in lowered
+        if not any(other != keyword and other in keyword for other in lowered)
+    ]
+
+
+@lru_cache(maxsize=4096)
+def _parse_job_date(date_str: str) -> Optional[datetime]:
+    """Parse a job date string that isn't plain ISO, returning None if it can't be parsed"""
+    try:
+        if 'T' in date_str:
+            return datetime.fromisoformat(date_str.rstrip('Z').partition('+')[0]).replace(tzinfo=None)
+        return datetime.strptime(date_str[:10], '%Y-%m-%d')
+    except ValueError:
+        return None
+
+
+FDE_MATCH_KEYWORDS = _minimal_keywords(config.FDE_KEYWORDS)
+
+# JobFields bound to module names - job builders skip a class attribute lookup per key
+_ROLE_NAME = JobFields.ROLE_NAME
+_COMPANY_NAME = JobFields.COMPANY_NAME
+_LOCATION = JobFields.LOCATION
+_JOB_LINK = JobFields.JOB_LINK
+_EMPLOYMENT_TYPE = JobFields.EMPLOYMENT_TYPE
+_TEAM = JobFields.TEAM
+_PUBLISHED_DATE = JobFields.PUBLISHED_DATE
+_COMPENSATION = JobFields.COMPENSATION
+_SOURCE = JobFields.SOURCE
+_JOB_ID = JobFields.JOB_ID
+
+# Single alternation over all FDE keywords - one scan per title instead of one per keyword
+FDE_KEYWORDS_PATTERN = re.compile('|'.join(re.escape(keyword) for keyword in FDE_MATCH_KEYWORDS), re.IGNORECASE)
+
+# FDE keywords as bytes for scanning raw payloads before JSON parsing
+FDE_KEYWORD_BYTES = tuple(keyword.encode('utf-8') for keyword in FDE_MATCH_KEYWORDS)
+
+# Process-wide cap on in-flight board requests, shared by every scraper - created per event loop
+_request_slots: Optional[asyncio.Semaphore] = None
+_request_slots_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_request_slots() -> asyncio.Semaphore:
+    """Request semaphore for the running event loop"""
+    global _request_slots, _request_slots_loop
+    loop = asyncio.get_running_loop()
+    if _request_slots is None or _request_slots_loop is not loop:
+        _request_slots = asyncio.Semaphore(config.HTTP_GLOBAL_REQUEST_LIMIT)
+        _request_slots_loop = loop
+    return _request_slots
+
+
 class AsyncBaseScraper(ABC):
     """Async base class for all job scrapers"""
     
-    def __init__(self, config_path: str, config_key: str = None):
+    # FDE title matcher, resolved from config at class definition
+    _fde_keyword_search = staticmethod(FDE_KEYWORDS_PATTERN.search)
+    
+    def __init__(self, config_path: str, config_key: str = None, conn_limit: int = None, per_host_limit: int = None):
         self.config_path = config_path
         self.config_key = config_key
+        self.conn_limit = config.HTTP_CONNECTION_LIMIT if conn_limit is None else conn_limit
+        self.per_host_limit = config.HTTP_CONNECTION_LIMIT_PER_HOST if per_host_limit is None else per_host_limit
         self.companies = self._load_companies()
+        # months -> (cutoff datetime, cutoff ISO date), reset at the start of each scrape_all
+        self._recent_cutoffs: Dict[int, Tuple[datetime, str]] = {}
+        
+        # Long-lived HTTP session, see _get_session
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session_concurrency: Optional[int] = None
         
     def _load_companies(self) -> List[Dict]:
         """Load company configuration"""
@@ -38,8 +116,8 @@ class AsyncBaseScraper(ABC):
             logger.warning(f"Config file not found: {self.config_path}")
             return []
             
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config_data = yaml.safe_load(f)
+        # Cached per process - scrapers sharing a config file parse it once
+        config_data = load_yaml(config_file)
         
         if self.config_key:
             # New unified config structure
@@ -49,9 +127,21 @@ class AsyncBaseScraper(ABC):
             # Legacy config structure (fallback)
             return config_data.get('companies', [])
     
-    def _filter_recent_jobs(self, jobs: List[Dict], months: int = 12) -> List[Dict]:
-        """Filter jobs published within the last N months"""
-        cutoff_date = datetime.now() - timedelta(days=months * 30)
+    def _recent_cutoff(self, months: int) -> Tuple[datetime, str]:
+        """Cutoff datetime and its ISO date for a months window, computed once per scrape_all run"""
+        cutoff = self._recent_cutoffs.get(months)
+        if cutoff is None:
+            cutoff_date = months_ago(datetime.now(), months)
+            # YYYY-MM-DD strings sort in date order, so well-formed dates are compared as text
+            cutoff = self._recent_cutoffs[months] = (cutoff_date, cutoff_date.date().isoformat())
+        return cutoff
+    
+    def _filter_recent_jobs(self, jobs: List[Dict], months: Optional[int] = 12) -> List[Dict]:
+        """Filter jobs published within the last N months (None or 10+ years disables the filter)"""
+        if months is None or months >= 120:
+            return jobs
+        
+        cutoff_date, cutoff_iso = self._recent_cutoff(months)
         recent_jobs = []
         
         for job in jobs:
@@ -66,144 +156,291 @@ class AsyncBaseScraper(ABC):
                 # If no date available, include the job (better safe than sorry)
                 recent_jobs.append(job)
                 continue
-                
-            try:
-                # Parse different date formats
-                if 'T' in str(date_str):
-                    # ISO format: 2024-07-20T10:30:00Z or 2024-07-20T10:30:00
-                    job_date = datetime.fromisoformat(str(date_str).replace('Z', '+00:00').split('+')[0])
-                else:
-                    # Date only: 2024-07-20
-                    job_date = datetime.strptime(str(date_str)[:10], '%Y-%m-%d')
-                    
-                if job_date >= cutoff_date:
+            
+            if isinstance(date_str, (int, float)):
+                # Epoch milliseconds (Lever createdAt) - compared by local date, cached per quarter hour
+                day = epoch_ms_to_date(date_str)
+                if not day or day >= cutoff_iso:
                     recent_jobs.append(job)
-            except (ValueError, TypeError):
+                continue
+            
+            date_str = str(date_str)
+            day = date_str[:10]
+            if len(day) == 10 and day[4] == '-' and day[7] == '-':
+                # ISO date or datetime: 2024-07-20 / 2024-07-20T10:30:00Z
+                if day >= cutoff_iso:
+                    recent_jobs.append(job)
+                continue
+            
+            # Anything else goes through the (cached) parser
+            job_date = _parse_job_date(date_str)
+            if job_date is None or job_date >= cutoff_date:
                 # If date parsing fails, include the job
                 recent_jobs.append(job)
                 
-        logger.info(f"Filtered {len(recent_jobs)} recent jobs (last {months} months) from {len(jobs)} total jobs")
+        logger.info("Filtered %d recent jobs (last %d months) from %d total jobs", len(recent_jobs), months, len(jobs))
         return recent_jobs
     
+    def _may_contain_fde_jobs(self, raw: bytes) -> bool:
+        """
+        Cheap pre-parse check on a raw API payload
+        
+        If no FDE keyword appears anywhere in the bytes, no job title can match
+        either, so the response can be dropped without parsing it.
+        """
+        raw_lower = raw.lower()
+        return any(keyword in raw_lower for keyword in FDE_KEYWORD_BYTES)
+    
     def _filter_fde_jobs(self, jobs: List[Dict]) -> List[Dict]:
         """Filter Forward Deployed Engineer related positions"""
-        fde_keywords = config.FDE_KEYWORDS
-        
+        # Bound once per call rather than looked up through the module global per job
+        matches_keyword = self._fde_keyword_search
         filtered_jobs = []
         for job in jobs:
             # Get title field - different scrapers use different field names
-            title = job.get('title', '') or job.get('text', '') or job.get('role_name', '')
-            title_lower = title.lower()
+            title = job.get('title') or job.get('text') or job.get('role_name') or ''
             
             # Check if job title contains keywords
-            if any(keyword in title_lower for keyword in fde_keywords):
+            if matches_keyword(title):
                 filtered_jobs.append(job)
                 
         return filtered_jobs
     
-    async def filter_and_collect_stats(self, jobs: List[Dict], company_name: str) -> Tuple[List[Dict], JobStats]:
+    async def filter_and_collect_stats(
+        self,
+        jobs: List[Dict],
+        company_name: str,
+        locations: List[str] = None
+    ) -> Tuple[List[Dict], JobStats]:
         """
         Filter US jobs and collect statistics
         
         Args:
-            jobs: List of job dictionaries
+            jobs: List of job dictionaries (formatted or raw API records)
             company_name: Name of the company for logging
+            locations: Optional locations aligned with jobs - lets scrapers filter
+                raw records before building formatted job dicts
             
         Returns:
             Tuple of (us_jobs, stats)
         """
-        stats = JobStats()
-        us_jobs = []
+        # Classify all locations in one batch so repeated strings are resolved once
+        if locations is None:
+            locations = [job.get('location', '') for job in jobs]
+        us_mask = await classify_us_locations(locations)
         
-        for job in jobs:
-            location = job.get('location', '')
-            if await is_us_location(location):
-                us_jobs.append(job)
-                stats.add_us_job()
-            else:
-                stats.add_non_us_job(location)
+        # Partition with itertools.compress (runs in C) instead of branching per job
+        us_jobs = list(compress(jobs, us_mask))
+        stats = JobStats(
+            total_jobs=len(jobs),
+            us_jobs=len(us_jobs),
+            non_us_jobs=len(jobs) - len(us_jobs)
+        )
+        
+        # Non-US locations are only consumed by the statistics log
+        if logger.isEnabledFor(logging.INFO):
+            non_us_locations = compress(locations, map(operator.not_, us_mask))
+            stats.non_us_locations.update(filter(None, non_us_locations))
         
         # Log statistics
         log_job_statistics(company_name, stats, logger)
         
         return us_jobs, stats
     
-    def create_job_dict(self, raw_job: Dict, company: Dict, source: JobSource) -> Dict:
+    @staticmethod
+    def _intern(value, default: str = '') -> str:
         """
-        Create standardized job dictionary from raw job data
+        Intern a repeated string value from an API payload
+        
+        Values like employment type, team and location repeat across most jobs
+        of a company; interning makes every job share one string object.
+        """
+        if not value or not isinstance(value, str):
+            return default
+        return sys.intern(value)
+    
+    def create_job_defaults(self, company: Dict, source: str) -> Dict:
+        """
+        Build the job fields that are the same for every job of a company
+        
+        Called once per company; create_job merges the result into each job.
         
         Args:
-            raw_job: Raw job data from API
             company: Company configuration
-            source: Job source (Ashby, Greenhouse, Lever)
+            source: Job source name (a JobSource value)
             
         Returns:
-            Standardized job dictionary
+            Dict of default job field values
         """
-        # Default field mapping - subclasses can override
         return {
-            JobFields.ROLE_NAME: raw_job.get('title', raw_job.get('text', '')),
-            JobFields.COMPANY_NAME: company['name'],
-            JobFields.LOCATION: raw_job.get('location', ''),
-            JobFields.JOB_LINK: '',  # Subclasses must set this
-            JobFields.EMPLOYMENT_TYPE: 'FullTime',
-            JobFields.TEAM: '',
-            JobFields.PUBLISHED_DATE: '',
-            JobFields.COMPENSATION: 'Not disclosed',
-            JobFields.SOURCE: source.value,
-            JobFields.JOB_ID: str(raw_job.get('id', ''))
+            _COMPANY_NAME: company['name'],
+            _JOB_LINK: '',  # Subclasses must set this
+            _EMPLOYMENT_TYPE: EmploymentTypeDefaults.FULL_TIME,
+            _TEAM: '',
+            _PUBLISHED_DATE: '',
+            _COMPENSATION: CompensationDefaults.NOT_DISCLOSED,
+            _SOURCE: source,
         }
     
+    def create_job(self, raw_job: Dict, job_defaults: Dict, **fields) -> Job:
+        """
+        Create standardized job record from raw job data
+        
+        Args:
+            raw_job: Raw job data from API
+            job_defaults: Per-company defaults from create_job_defaults
+            **fields: Platform-specific field values overriding the defaults
+            
+        Returns:
+            Standardized Job record
+        """
+        # Generic per-job fields are only derived when the subclass didn't pass its own,
+        # and the defaults and fields are merged in a single dict display
+        if _JOB_ID not in fields:
+            fields[_JOB_ID] = str(raw_job.get('id', ''))
+        if _ROLE_NAME not in fields:
+            fields[_ROLE_NAME] = raw_job.get('title') or raw_job.get('text') or ''
+        if _LOCATION not in fields:
+            fields[_LOCATION] = raw_job.get('location', '')
+        
+        # Every Job field is a string - a null or numeric API value would otherwise
+        # surface later as an AttributeError in dedup or export
+        job_fields = {**job_defaults, **fields}
+        for name, value in job_fields.items():
+            if value.__class__ is not str:
+                job_fields[name] = '' if value is None else str(value)
+        return Job(**job_fields)
+    
+    async def fetch_raw(self, session: aiohttp.ClientSession, url: str, company_name: str) -> Optional[bytes]:
+        """
+        Fetch a job board URL as raw bytes
+        
+        Callers decode the body themselves (orjson/msgspec) instead of going through
+        response.json()'s stdlib parser, after any cheap checks on the raw bytes.
+        
+        Returns:
+            Response body, or None if the request didn't return HTTP 200
+        """
+        # Callers already hold one of the scraper's company slots, sized so a connection is
+        # free for each - the shared slot is only held by requests that can start right
+        # away, and caps the total when all scrapers run at once
+        async with _get_request_slots(), session.get(url) as response:
+            if response.status != 200:
+                logger.error(LogMessages.HTTP_ERROR.format(status=response.status, company=company_name))
+                return None
+            
+            return await response.read()
+    
     @abstractmethod
-    async def scrape_company(self, session: aiohttp.ClientSession, company: Dict) -> List[Dict]:
+    async def scrape_company(self, session: aiohttp.ClientSession, company: Dict) -> List[Job]:
         """Scrape jobs from a single company - must be implemented by subclasses"""
         pass
     
-    async def scrape_all(self, max_concurrent: int = 5) -> List[Dict]:
-        """Scrape jobs from all companies concurrently"""
-        if not self.companies:
-            logger.warning("No companies configured")
-            return []
+    async def _safe_scrape(self, session: aiohttp.ClientSession, company: Dict,
+                           semaphore: asyncio.Semaphore) -> List[Job]:
+        """Scrape one company once a semaphore slot is free, returning [] on failure"""
+        async with semaphore:
+            try:
+                return await self.scrape_company(session, company)
+            except Exception as e:
+                logger.error(f"Failed to scrape {company.get('name', 'Unknown')}: {e}")
+                return []
+    
+    def _create_session(self, max_concurrent: int) -> aiohttp.ClientSession:
+        """Create the pooled HTTP session used for scraping"""
+        # Pooled keep-alive connections are reused by every company on the same job board host
+        # With aiodns installed (aiohttp >= 3.10) the default resolver is the c-ares backed
+        # AsyncResolver, so lookups don't go through getaddrinfo in a thread pool
+        connector = aiohttp.TCPConnector(
+            limit=self.conn_limit,
+            limit_per_host=min(max_concurrent, self.per_host_limit),
+            keepalive_timeout=config.HTTP_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=config.DNS_CACHE_TTL,
+            use_dns_cache=True
+        )
+        timeout = aiohttp.ClientTimeout(total=config.HTTP_TOTAL_TIMEOUT, connect=config.HTTP_CONNECT_TIMEOUT)
         
-        connector = aiohttp.TCPConnector(limit=20, limit_per_host=5)
-        timeout = aiohttp.ClientTimeout(total=60, connect=15)  # Increased for large companies
+        # aiohttp speaks HTTP/1.1 only, so connection reuse comes from the keep-alive pool
+        # above rather than HTTP/2 multiplexing - force_close stays off and every company
+        # on the same host shares warm TLS connections
         
-        async with aiohttp.ClientSession(
+        return aiohttp.ClientSession(
             connector=connector,
             timeout=timeout,
             headers={
                 'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
             }
-        ) as session:
-            # Create semaphore to limit concurrent requests
-            semaphore = asyncio.Semaphore(max_concurrent)
-            
-            async def scrape_with_semaphore(company):
-                async with semaphore:
-                    try:
-                        return await self.scrape_company(session, company)
-                    except Exception as e:
-                        logger.error(f"Failed to scrape {company.get('name', 'Unknown')}: {e}")
-                        return []
-            
-            # Create tasks for all companies
-            tasks = [scrape_with_semaphore(company) for company in self.companies]
-            
-            # Run all tasks concurrently
-            logger.info(f"🚀 Starting async scraping of {len(tasks)} companies with max {max_concurrent} concurrent requests")
-            start_time = time.time()
-            
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            end_time = time.time()
-            logger.info(f"⚡ Async scraping completed in {end_time - start_time:.2f} seconds")
-            
-            # Flatten results and filter out exceptions
-            all_jobs = []
-            for result in results:
-                if isinstance(result, Exception):
-                    logger.error(f"Task failed with exception: {result}")
-                elif isinstance(result, list):
-                    all_jobs.extend(result)
+        )
+    
+    async def _get_session(self, max_concurrent: int) -> aiohttp.ClientSession:
+        """
+        Return the scraper's long-lived session, creating it on first use
+        
+        The session - with its warm connections and DNS cache - is kept across
+        scrape_all calls. It's rebuilt if it was closed, belongs to another event
+        loop, or was sized for a different max_concurrent.
+        """
+        loop = asyncio.get_running_loop()
+        if (self._session is None or self._session.closed
+                or self._session_loop is not loop or self._session_concurrency != max_concurrent):
+            if self._session is not None and not self._session.closed and self._session_loop is loop:
+                await self._session.close()
+            self._session = self._create_session(max_concurrent)
+            self._session_loop = loop
+            self._session_concurrency = max_concurrent
+        return self._session
+    
+    async def close(self):
+        """Close the scraper's HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def scrape_all(self, max_concurrent: int = 5) -> List[Job]:
+        """Scrape jobs from all companies concurrently"""
+        if not self.companies:
+            logger.warning("No companies configured")
+            return []
+        
+        # Every company in this run filters against the same cutoff dates
+        self._recent_cutoffs = {}
+        
+        session = await self._get_session(max_concurrent)
+        
+        # Limit how many companies are scraped at once. aiohttp counts the wait for a pooled
+        # connection against the request timeout, so companies queue here rather than in
+        # the connector, where the wait would grow with the number of companies. No more
+        # slots than pooled connections, so a company holding a slot never waits for one
+        slots = min(max_concurrent, self.per_host_limit)
+        if self.conn_limit:
+            slots = min(slots, self.conn_limit)
+        semaphore = asyncio.Semaphore(slots)
+        
+        # Run all tasks concurrently
+        logger.info("🚀 Starting async scraping of %d companies with max %d concurrent requests", len(self.companies), max_concurrent)
+        start_time = time.time()
+        
+        # TaskGroup gives structured cancellation and cheaper task setup than gather;
+        # _safe_scrape never raises, so one failing company can't cancel the rest
+        all_jobs = []
+        async with asyncio.TaskGroup() as task_group:
+            tasks = [
+                task_group.create_task(self._safe_scrape(session, company, semaphore))
+                for company in self.companies
+            ]
             
-            return all_jobs
\ No newline at end of file
+            # Collect each company's jobs as soon as it finishes instead of
+            # holding every result list until the slowest company returns
+            for next_done in asyncio.as_completed(tasks):
+                all_jobs.extend(await next_done)
+        
+        end_time = time.time()
+        logger.info("⚡ Async scraping completed in %.2f seconds", end_time - start_time)
+        
+        return all_jobs
\ No newline at end of file
@@ -19,6 +19,9 @@ LOGS_DIR.mkdir(parents=True, exist_ok=True)
 # Configuration file paths
 COMPANIES_CONFIG = CONFIG_DIR / "companies.yaml"
 
+# Geocoded location verdicts, kept between runs
+LOCATION_CACHE_FILE = DATA_DIR / "location_cache.json"
+
 # API endpoints
 GREENHOUSE_API_URL = "https://boards-api.greenhouse.io/v1/boards/{board_name}/jobs"
 LEVER_API_URL = "https://api.lever.co/v0/postings/{company_name}?mode=json"
@@ -27,6 +30,25 @@ LEVER_API_URL = "https://api.lever.co/v0/postings/{company_name}?mode=json"
 REQUEST_DELAY = 2  # seconds between requests
 REQUEST_TIMEOUT = 30  # seconds - increased for large companies like Databricks
 
+# HTTP connection pool settings (one pooled session per scrape_all run)
+HTTP_CONNECTION_LIMIT = 0  # 0 = no total cap, the per-host limit is the real governor
+HTTP_CONNECTION_LIMIT_PER_HOST = 10
+HTTP_GLOBAL_REQUEST_LIMIT = 24  # in-flight board requests across all scrapers in the process
+HTTP_KEEPALIVE_TIMEOUT = 30  # seconds - keep idle connections for reuse across companies on the same host
+DNS_CACHE_TTL = 600  # seconds - board hosts don't move within a run
+HTTP_TOTAL_TIMEOUT = 60  # seconds per request - increased for large companies
+HTTP_CONNECT_TIMEOUT = 15  # seconds - only paid when no pooled connection is free
+
+# Ashby pages at least this large are parsed in a worker process - smaller ones parse
+# faster on the event loop than the round trip to a worker takes
+ASHBY_PROCESS_PARSE_MIN_BYTES = 2 * 1024 * 1024
+
+# Notion sync settings
+NOTION_MAX_CONCURRENT = 3  # jobs in flight at once - Notion averages 3 requests/second per integration
+NOTION_REQUESTS_PER_SECOND = 3  # request starts are spaced to stay under Notion's rate limit
+NOTION_MAX_RETRIES = 5  # retries for a request Notion throttled (429) or failed (5xx)
+NOTION_LINK_FILTER_BATCH = 100  # job links per existence query - Notion's cap on filter conditions
+
 # Logging settings
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 LOG_FILE = LOGS_DIR / "run.log"
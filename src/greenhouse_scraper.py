@@ -4,73 +4,92 @@ Async Greenhouse Job Scraper
 Scrape Forward Deployed Engineer related positions from Greenhouse using aiohttp
 """
 
-import asyncio
-import json
 import logging
 import aiohttp
-from typing import List, Dict
+from types import MappingProxyType
+from typing import List, Dict, Tuple
 from base_scraper import AsyncBaseScraper
 import config
-from models import JobSource
-from utils import log_scraper_start, with_error_handling
+from models import Job, JobSource, GreenhouseBoard
+from utils import log_scraper_start, with_error_handling, make_json_decoder, run_async
 
 logger = logging.getLogger(__name__)
 
+# Resolved once - JobSource.value is an enum property lookup
+SOURCE_NAME = JobSource.GREENHOUSE.value
+
+# Shared read-only stand-in for a missing location object - no new dict per job
+NO_LOCATION = MappingProxyType({})
+
+# Decodes only the job fields we read when msgspec is installed
+decode_board = make_json_decoder(GreenhouseBoard)
+
 
 class AsyncGreenhouseScraper(AsyncBaseScraper):
     def __init__(self, config_path: str = None, config_key: str = None):
         super().__init__(config_path or str(config.COMPANIES_CONFIG), config_key or 'greenhouse')
     
+    def _parse_jobs(self, raw: bytes) -> Tuple[int, List[Dict]]:
+        """
+        Parse a Greenhouse board response
+        
+        With msgspec installed only the job fields we read are decoded.
+        
+        Returns:
+            Tuple of (total job count, FDE related jobs)
+        """
+        all_jobs = decode_board(raw).get('jobs', [])
+        return len(all_jobs), self._filter_fde_jobs(all_jobs)
+    
     @with_error_handling(default_return=[])
-    async def scrape_company(self, session: aiohttp.ClientSession, company: Dict) -> List[Dict]:
+    async def scrape_company(self, session: aiohttp.ClientSession, company: Dict) -> List[Job]:
         """Scrape jobs from a single company asynchronously"""
         log_scraper_start(company['name'], 'Greenhouse', logger)
         
         # Use Greenhouse API
         api_url = config.GREENHOUSE_API_URL.format(board_name=company['board_name'])
         
-        async with session.get(api_url) as response:
-            if response.status != 200:
-                logger.error(f"HTTP {response.status} for {company['name']}")
-                return []
-            
-            data = await response.json()
+        # Parse raw bytes directly - skips aiohttp's content-type check and charset detection
+        raw = await self.fetch_raw(session, api_url, company['name'])
+        if raw is None:
+            return []
         
-        all_jobs = data.get('jobs', [])
-        logger.info(f"Found {len(all_jobs)} jobs from {company['name']}")
+        # Boards without any FDE keyword in the payload can't have a matching title
+        if not self._may_contain_fde_jobs(raw):
+            logger.info("Filtered 0 FDE related jobs from %s", company['name'])
+            return []
         
-        # Filter recent jobs first (optimization to reduce processing time)
-        recent_jobs = self._filter_recent_jobs(all_jobs, months=12)
+        # Filter FDE related jobs while parsing, so non-matching records are never materialized
+        total_count, fde_candidates = self._parse_jobs(raw)
+        logger.info("Found %d jobs from %s", total_count, company['name'])
         
-        # Filter FDE related jobs from recent jobs only
-        fde_jobs = self._filter_fde_jobs(recent_jobs)
-        logger.info(f"Filtered {len(fde_jobs)} FDE related jobs from {company['name']}")
+        # Filter recent jobs from FDE candidates only
+        fde_jobs = self._filter_recent_jobs(fde_candidates, months=12)
+        logger.info("Filtered %d FDE related jobs from %s", len(fde_jobs), company['name'])
         
-        # Format data
-        formatted_jobs = []
-        for job in fde_jobs:
-            # Create base job dict
-            formatted_job = self.create_job_dict(job, company, JobSource.GREENHOUSE)
-            
-            # Extract department info
-            departments = job.get('departments', [])
-            department_name = departments[0].get('name', '') if departments else ''
-            
-            # Override with Greenhouse-specific fields
-            formatted_job.update({
-                'role_name': job.get('title', ''),
-                'location': job.get('location', {}).get('name', ''),
-                'job_link': job.get('absolute_url', ''),
-                'team': department_name,
-                'published_date': job.get('updated_at', '').split('T')[0] if job.get('updated_at') else '',
-            })
-            
-            formatted_jobs.append(formatted_job)
+        # Filter US-only jobs on the location column first, then format only the survivors
+        locations = [(job.get('location') or NO_LOCATION).get('name', '') for job in fde_jobs]
+        us_jobs, stats = await self.filter_and_collect_stats(fde_jobs, company['name'], locations)
         
-        # Filter US-only jobs and collect statistics
-        us_jobs, stats = await self.filter_and_collect_stats(formatted_jobs, company['name'])
-        return us_jobs
-
+        job_defaults = self.create_job_defaults(company, SOURCE_NAME)
+        return [self._format_job(job, job_defaults) for job in us_jobs]
+    
+    def _format_job(self, job: Dict, job_defaults: Dict) -> Job:
+        """Build the standardized job record from a Greenhouse job"""
+        # Extract department info
+        departments = job.get('departments', [])
+        department_name = departments[0].get('name', '') if departments else ''
+        updated_at = job.get('updated_at')
+        
+        # Override with Greenhouse-specific fields
+        return self.create_job(
+            job, job_defaults,
+            role_name=job.get('title', ''),
+            location=self._intern((job.get('location') or NO_LOCATION).get('name')),
+            job_link=job.get('absolute_url', ''),
+            team=self._intern(department_name),
+            published_date=updated_at.partition('T')[0] if updated_at else '',
+        )
 
 async def main():
     """Test the async Greenhouse scraper"""
@@ -88,15 +107,16 @@ async def main():
         return
     
     # Scrape all jobs
-    jobs = await scraper.scrape_all(max_concurrent=8)
+    async with scraper:
+        jobs = await scraper.scrape_all(max_concurrent=8)
     
     if jobs:
         print(f"✅ Found {len(jobs)} async Greenhouse FDE jobs")
         for job in jobs[:5]:  # Show first 5
-            print(f"  • {job['role_name']} at {job['company_name']} ({job['location']})")
+            print(f"  • {job.role_name} at {job.company_name} ({job.location})")
     else:
         print("❌ No Greenhouse FDE jobs found")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run_async(main())
\ No newline at end of file
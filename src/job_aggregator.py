@@ -16,13 +16,15 @@ from scraper_factory import create_scraper
 from models import JobSource
 from data_processor_pandas import JobDataProcessor
 from notion_sync import NotionSync
+from location_filter import close_location_filter, get_location_cache_stats
+from utils import queued_file_handler, run_async
 
-# Configure logging
+# Configure logging - the log file is written from a background thread, off the event loop
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler('logs/run.log'),
+        queued_file_handler(),
         logging.StreamHandler()
     ]
 )
@@ -30,8 +32,16 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def run_all_scrapers_async():
-    """Run all scrapers concurrently for maximum performance"""
+async def run_all_scrapers_async(processor: JobDataProcessor):
+    """
+    Run all scrapers concurrently for maximum performance
+    
+    Each platform's jobs are handed to the processor as soon as that scraper and
+    every platform ahead of it have finished, so filtering and exact dedup overlap
+    with the scrapers still running. Batches always go in Ashby, Greenhouse, Lever
+    order, so the copy of a cross-platform duplicate that survives doesn't depend
+    on which scraper happened to finish first.
+    """
     
     # Initialize async scrapers using factory
     ashby_scraper = create_scraper(JobSource.ASHBY)
@@ -41,33 +51,42 @@ async def run_all_scrapers_async():
     logger.info("🚀 Starting async scraping of all platforms...")
     start_time = time.time()
     
+    async def run_scraper(name, scraper, max_concurrent):
+        # One platform failing must not cancel the others - log it and contribute no jobs
+        try:
+            return name, await scraper.scrape_all(max_concurrent=max_concurrent)
+        except Exception as e:
+            logger.error(f"{name} scraper failed: {e}")
+            return name, []
+    
     # Run all scrapers concurrently
     tasks = [
-        ashby_scraper.scrape_all(max_concurrent=10),
-        greenhouse_scraper.scrape_all(max_concurrent=8),
-        lever_scraper.scrape_all(max_concurrent=8)
+        run_scraper('Ashby', ashby_scraper, 10),
+        run_scraper('Greenhouse', greenhouse_scraper, 8),
+        run_scraper('Lever', lever_scraper, 8)
     ]
     
-    # Wait for all scrapers to complete
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    # Process each scraper's results in platform order as they complete, then close
+    # their HTTP sessions
+    batch_order = ['Ashby', 'Greenhouse', 'Lever']
+    finished = {}
+    job_counts = {}
+    async with ashby_scraper, greenhouse_scraper, lever_scraper:
+        for next_result in asyncio.as_completed(tasks):
+            name, jobs = await next_result
+            job_counts[name] = len(jobs)
+            finished[name] = jobs
+            while batch_order and batch_order[0] in finished:
+                processor.add_batch(finished.pop(batch_order.pop(0)))
+    
+    # Locations are only geocoded while scraping - save what was learned and release that session
+    await close_location_filter()
+    logger.info(f"📍 Location cache stats: {get_location_cache_stats()}")
     
     end_time = time.time()
     logger.info(f"⚡ All async scraping completed in {end_time - start_time:.2f} seconds")
     
-    # Extract results
-    ashby_jobs = results[0] if not isinstance(results[0], Exception) else []
-    greenhouse_jobs = results[1] if not isinstance(results[1], Exception) else []
-    lever_jobs = results[2] if not isinstance(results[2], Exception) else []
-    
-    # Log any exceptions
-    for i, result in enumerate(results):
-        if isinstance(result, Exception):
-            scraper_names = ['Ashby', 'Greenhouse', 'Lever']
-            logger.error(f"{scraper_names[i]} scraper failed: {result}")
-    
-    logger.info(f"📊 Scraping results: {len(ashby_jobs)} Ashby, {len(greenhouse_jobs)} Greenhouse, {len(lever_jobs)} Lever jobs")
-    
-    return ashby_jobs, greenhouse_jobs, lever_jobs
+    logger.info(f"📊 Scraping results: {job_counts['Ashby']} Ashby, {job_counts['Greenhouse']} Greenhouse, {job_counts['Lever']} Lever jobs")
 
 
 async def main():
@@ -75,13 +94,13 @@ async def main():
     try:
         logger.info("🚀 Starting async job aggregation process")
         
-        # Run all scrapers concurrently
-        ashby_jobs, greenhouse_jobs, lever_jobs = await run_all_scrapers_async()
+        # Run all scrapers concurrently, filtering each platform's jobs as it finishes
+        processor = JobDataProcessor()
+        await run_all_scrapers_async(processor)
         
-        # Process and deduplicate (this is still sync since pandas is sync)
+        # Consolidate locations across platforms (this is still sync since pandas is sync)
         logger.info("📊 Processing and deduplicating results...")
-        processor = JobDataProcessor()
-        final_jobs = processor.merge_and_deduplicate(ashby_jobs, greenhouse_jobs, lever_jobs)
+        final_jobs = processor.finalize()
         
         # Save to CSV
         csv_path = processor.save_to_csv(final_jobs)
@@ -98,7 +117,7 @@ async def main():
             logger.info(f"📊 Notion cache stats: {cache_stats}")
             
             # Sync jobs
-            sync_stats = notion_sync.sync_jobs(final_jobs)
+            sync_stats = await notion_sync.sync_jobs_async(final_jobs)
             logger.info(f"✅ Notion sync completed: {sync_stats}")
             
         except Exception as e:
@@ -112,8 +131,8 @@ async def main():
 
 
 def sync_main():
-    """Synchronous entry point for compatibility"""
-    asyncio.run(main())
+    """Synchronous entry point for compatibility - runs on uvloop when it is installed"""
+    run_async(main())
 
 
 if __name__ == "__main__":
@@ -4,77 +4,89 @@ Async Lever Job Scraper
 Scrape Forward Deployed Engineer related positions from Lever using aiohttp
 """
 
-import asyncio
-import json
 import logging
 import aiohttp
+from types import MappingProxyType
 from typing import List, Dict
 from base_scraper import AsyncBaseScraper
 import config
-from models import JobSource
-from utils import log_scraper_start, with_error_handling, timestamp_to_date
+from models import Job, JobSource, LeverPosting
+from utils import log_scraper_start, with_error_handling, make_json_decoder, run_async, epoch_ms_to_date
+from constants import URLTemplates, EmploymentTypeDefaults
 
 logger = logging.getLogger(__name__)
 
+# Resolved once - JobSource.value is an enum property lookup
+SOURCE_NAME = JobSource.LEVER.value
+
+# Shared read-only stand-in for a missing categories object - no new dict per job
+NO_CATEGORIES = MappingProxyType({})
+
+# Decodes only the posting fields we read when msgspec is installed
+decode_postings = make_json_decoder(List[LeverPosting])
+
 
 class AsyncLeverScraper(AsyncBaseScraper):
     def __init__(self, config_path: str = None, config_key: str = None):
         super().__init__(config_path or str(config.COMPANIES_CONFIG), config_key or 'lever')
     
     @with_error_handling(default_return=[])
-    async def scrape_company(self, session: aiohttp.ClientSession, company: Dict) -> List[Dict]:
+    async def scrape_company(self, session: aiohttp.ClientSession, company: Dict) -> List[Job]:
         """Scrape jobs from a single company asynchronously"""
         log_scraper_start(company['name'], 'Lever', logger)
         
         # Use Lever API
         api_url = config.LEVER_API_URL.format(company_name=company['lever_name'])
         
-        async with session.get(api_url) as response:
-            if response.status != 200:
-                logger.error(f"HTTP {response.status} for {company['name']}")
-                return []
-            
-            all_jobs = await response.json()
+        raw = await self.fetch_raw(session, api_url, company['name'])
+        if raw is None:
+            return []
         
-        logger.info(f"Found {len(all_jobs)} jobs from {company['name']}")
+        # Boards without any FDE keyword in the payload can't have a matching title
+        if not self._may_contain_fde_jobs(raw):
+            logger.info("Filtered 0 FDE related jobs from %s", company['name'])
+            return []
         
-        # Filter recent jobs first (optimization to reduce processing time)
-        recent_jobs = self._filter_recent_jobs(all_jobs, months=12)
+        # Parse raw bytes directly - skips aiohttp's content-type check and charset detection
+        all_jobs = decode_postings(raw)
+        logger.info("Found %d jobs from %s", len(all_jobs), company['name'])
         
-        # Filter FDE related jobs from recent jobs only
-        fde_jobs = self._filter_fde_jobs(recent_jobs)
-        logger.info(f"Filtered {len(fde_jobs)} FDE related jobs from {company['name']}")
+        # Filter FDE related jobs first - a title match drops nearly every posting,
+        # so the date check only runs on the few candidates
+        fde_candidates = self._filter_fde_jobs(all_jobs)
         
-        # Format data
-        formatted_jobs = []
-        for job in fde_jobs:
-            # Create base job dict
-            formatted_job = self.create_job_dict(job, company, JobSource.LEVER)
-            
-            # Extract location and other data from categories
-            categories = job.get('categories', {})
-            location = categories.get('location', '')
-            
-            # Convert timestamp to date
-            created_timestamp = job.get('createdAt', 0)
-            published_date = timestamp_to_date(created_timestamp) if created_timestamp else ''
-            
-            # Override with Lever-specific fields
-            formatted_job.update({
-                'role_name': job.get('text', ''),
-                'location': location,
-                'job_link': f"https://jobs.lever.co/{company['lever_name']}/{job.get('id', '')}",
-                'employment_type': categories.get('commitment', 'FullTime'),
-                'team': categories.get('team', ''),
-                'published_date': published_date,
-            })
-            
-            formatted_jobs.append(formatted_job)
+        # Filter recent jobs from FDE candidates only
+        fde_jobs = self._filter_recent_jobs(fde_candidates, months=12)
+        logger.info("Filtered %d FDE related jobs from %s", len(fde_jobs), company['name'])
         
-        # Filter US-only jobs and collect statistics
-        us_jobs, stats = await self.filter_and_collect_stats(formatted_jobs, company['name'])
-        return us_jobs
-
+        # Filter US-only jobs on the location column first, then format only the survivors
+        locations = [(job.get('categories') or NO_CATEGORIES).get('location', '') for job in fde_jobs]
+        us_jobs, stats = await self.filter_and_collect_stats(fde_jobs, company['name'], locations)
+        
+        job_link_prefix = URLTemplates.LEVER_JOB.format(lever_name=company['lever_name'], job_id='')
+        job_defaults = self.create_job_defaults(company, SOURCE_NAME)
+        return [self._format_job(job, job_defaults, job_link_prefix) for job in us_jobs]
+    
+    def _format_job(self, job: Dict, job_defaults: Dict, job_link_prefix: str) -> Job:
+        """Build the standardized job record from a Lever posting"""
+        # Extract location and other data from categories
+        categories = job.get('categories') or NO_CATEGORIES
+        location = categories.get('location', '')
+        
+        # Convert timestamp to date
+        created_timestamp = job.get('createdAt', 0)
+        published_date = epoch_ms_to_date(created_timestamp) if created_timestamp else ''
+        
+        # Override with Lever-specific fields
+        return self.create_job(
+            job, job_defaults,
+            role_name=job.get('text', ''),
+            location=self._intern(location),
+            job_link=job_link_prefix + job.get('id', ''),
+            employment_type=self._intern(categories.get('commitment'), EmploymentTypeDefaults.FULL_TIME),
+            team=self._intern(categories.get('team')),
+            published_date=published_date,
+        )
 
 async def main():
     """Test the async Lever scraper"""
@@ -92,15 +104,16 @@ async def main():
         return
     
     # Scrape all jobs
-    jobs = await scraper.scrape_all(max_concurrent=8)
+    async with scraper:
+        jobs = await scraper.scrape_all(max_concurrent=8)
     
     if jobs:
         print(f"✅ Found {len(jobs)} async Lever FDE jobs")
         for job in jobs[:5]:  # Show first 5
-            print(f"  • {job['role_name']} at {job['company_name']} ({job['location']})")
+            print(f"  • {job.role_name} at {job.company_name} ({job.location})")
     else:
         print("❌ No Lever FDE jobs found")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run_async(main())
\ No newline at end of file
@@ -4,26 +4,56 @@ Smart Location Filter
 Intelligent US location detection with multiple fallback strategies
 """
 
+import os
 import re
 import logging
 import time
 import asyncio
-from typing import Optional, Dict, Any
-import requests
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+import aiohttp
+import config
+from utils import json_dumps, json_loads
 
 logger = logging.getLogger(__name__)
 
+# Distinct lowercased locations whose pattern verdict is kept
+PATTERN_CACHE_SIZE = 4096
+
+# Free Nominatim API (OpenStreetMap)
+GEOCODE_URL = "https://nominatim.openstreetmap.org/search"
+GEOCODE_TIMEOUT = 10  # seconds
+
 
 class LocationFilter:
     """Smart location filter with multiple detection strategies"""
     
-    def __init__(self):
-        # Cache for API results
-        self._cache: Dict[str, bool] = {}
+    def __init__(self, cache_file: Optional[Path] = None):
+        # Geocoded verdicts, persisted to cache_file (if given) so later runs skip Nominatim
+        self._cache_file = cache_file
+        self._geocoded: Dict[str, bool] = self._load_geocoded()
+        self._geocoded_dirty = False
+        
+        # Cache for API results (geocoded or fallback verdicts) - pattern verdicts live in
+        # the LRU cache below, so this only grows by one entry per geocoding attempt
+        self._cache: Dict[str, bool] = dict(self._geocoded)
         
         # Rate limiting for Nominatim API (1 request per second)
         self._last_api_call: float = 0
         
+        # Serializes geocoding across concurrent scrapers - created per event loop
+        self._geocode_lock: Optional[asyncio.Lock] = None
+        self._geocode_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # In-flight lookups by lowercased location
+        self._pending: Dict[str, asyncio.Future] = {}
+        
+        # Geocoding HTTP session - created on the first lookup, per event loop
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        
         # High-confidence patterns
         self.us_patterns = [
             r'^remote$|^us\s*-?\s*remote$',  # Only match pure "Remote" or "US Remote", not "Remote - Country"
@@ -42,37 +72,68 @@ class LocationFilter:
             r'\b(mexico|argentina|chile|colombia|peru|spain|italy|netherlands|poland|sweden)\b',
             r'\b(dublin|paris|berlin|amsterdam|stockholm|madrid|rome|warsaw)\b'
         ]
+        
+        # Each pattern list compiled into one alternation - one scan per location
+        # instead of one re.search (and re cache lookup) per pattern. Locations are
+        # lowercased before matching and the patterns are lowercase, so no IGNORECASE -
+        # case-sensitive matching skips per-character case folding and runs about 2x faster
+        self._non_us_regex = re.compile('|'.join(f'(?:{pattern})' for pattern in self.non_us_patterns))
+        self._us_regex = re.compile('|'.join(f'(?:{pattern})' for pattern in self.us_patterns))
+        
+        # Pattern verdicts depend only on the location string - bounded, C-implemented memo
+        self._pattern_lookup = lru_cache(maxsize=PATTERN_CACHE_SIZE)(self._pattern_match)
     
     async def is_us_location(self, location: str) -> bool:
         """
         Determine if a location is in the US using multiple strategies
         
         Strategy priority:
-        1. Cache lookup
-        2. Pattern matching (high confidence)
+        1. Pattern matching (high confidence, LRU-cached)
+        2. Cache lookup of earlier geocoding results
         3. Geocoding API (with caching)
         4. Conservative fallback (filter out unknown)
         """
-        if not location or not location.strip():
-            return True
-            
+        # 1-2. Pattern matching and cache lookup, no I/O
+        result = self._resolve_fast(location)
+        if result is not None:
+            return result
+        
+        return await self._resolve_remote(location)
+    
+    async def _resolve_remote(self, location: str) -> bool:
+        """Resolve a location the cache and patterns couldn't decide"""
         location = location.strip()
         location_key = location.lower()
         
-        # 1. Check cache
-        if location_key in self._cache:
-            return self._cache[location_key]
+        # Scrapers asking for a location that is already being looked up wait on that
+        # lookup instead of queueing behind other locations for their own
+        lookup = self._pending.get(location_key)
+        if lookup is None or lookup.get_loop() is not asyncio.get_running_loop():
+            lookup = asyncio.ensure_future(self._lookup_location(location, location_key))
+            self._pending[location_key] = lookup
+            
+            def forget(done: asyncio.Future):
+                if self._pending.get(location_key) is done:
+                    del self._pending[location_key]
+            lookup.add_done_callback(forget)
         
-        # 2. Pattern matching (high confidence)
-        result = self._pattern_match(location_key)
-        if result is not None:
-            self._cache[location_key] = result
-            return result
+        # Shielded so a cancelled caller doesn't cancel the lookup other callers share
+        return await asyncio.shield(lookup)
+    
+    async def _lookup_location(self, location: str, location_key: str) -> bool:
+        """Geocode one location, caching the verdict"""
+        # 3. Try geocoding API (with timeout and error handling). Nominatim allows one
+        # request per second, so lookups run one at a time rather than in parallel
+        async with self._get_geocode_lock():
+            # Another scraper may have resolved this location while we waited
+            if location_key in self._cache:
+                return self._cache[location_key]
+            result = await self._geocode_location(location)
         
-        # 3. Try geocoding API (with timeout and error handling)
-        result = await self._geocode_location(location)
         if result is not None:
             self._cache[location_key] = result
+            self._geocoded[location_key] = result
+            self._geocoded_dirty = True
             return result
         
         # 4. Conservative fallback: filter out unknown locations (better safe than sorry)
@@ -80,20 +141,127 @@ class LocationFilter:
         self._cache[location_key] = False
         return False
     
+    async def classify_locations(self, locations: List[str]) -> List[bool]:
+        """
+        Classify a batch of locations as US / non-US
+        
+        Jobs from one board repeat the same few location strings, so each
+        distinct string is resolved once and the verdict reused for the rest.
+        
+        Returns:
+            List of booleans aligned with the input locations
+        """
+        verdicts: Dict[str, bool] = {}
+        for location in locations:
+            if location not in verdicts:
+                # Only locations the cache and patterns can't decide need a coroutine
+                verdict = self._resolve_fast(location)
+                if verdict is None:
+                    verdict = await self._resolve_remote(location)
+                verdicts[location] = verdict
+        return [verdicts[location] for location in locations]
+    
+    def _get_geocode_lock(self) -> asyncio.Lock:
+        """Geocoding lock for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._geocode_lock is None or self._geocode_lock_loop is not loop:
+            self._geocode_lock = asyncio.Lock()
+            self._geocode_lock_loop = loop
+        return self._geocode_lock
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Geocoding session for the running event loop, kept across lookups"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=GEOCODE_TIMEOUT),
+                headers={
+                    'User-Agent': 'FastJobAgent/1.0 (https://github.com/shuai/fast-job-agent; job-scraper)',
+                    'Accept': 'application/json',
+                    'Accept-Language': 'en-US,en;q=0.9'
+                }
+            )
+            self._session_loop = loop
+        return self._session
+    
+    def _load_geocoded(self) -> Dict[str, bool]:
+        """Load geocoded verdicts saved by earlier runs"""
+        if self._cache_file is None or not self._cache_file.exists():
+            return {}
+        
+        try:
+            data = json_loads(self._cache_file.read_bytes())
+            return {location: bool(is_us) for location, is_us in data.get('locations', {}).items()}
+        except Exception as e:
+            logger.warning(f"Failed to load location cache: {e}")
+            return {}
+    
+    def save_cache(self) -> None:
+        """
+        Save geocoded verdicts for later runs
+        
+        Only real geocoding answers are kept - fallback verdicts for locations
+        Nominatim couldn't resolve are retried next run.
+        """
+        if self._cache_file is None or not self._geocoded_dirty:
+            return
+        
+        try:
+            self._cache_file.parent.mkdir(parents=True, exist_ok=True)
+            data = {
+                'locations': self._geocoded,
+                'last_saved': datetime.now().isoformat()
+            }
+            # Compact, and swapped in whole so an interrupted run can't leave a truncated cache
+            temp_file = self._cache_file.with_name(self._cache_file.name + '.tmp')
+            temp_file.write_bytes(json_dumps(data))
+            os.replace(temp_file, self._cache_file)
+            self._geocoded_dirty = False
+            logger.debug("Saved %d geocoded locations to cache", len(self._geocoded))
+        except Exception as e:
+            logger.error(f"Failed to save location cache: {e}")
+    
+    async def close(self):
+        """Close the geocoding HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    def _resolve_fast(self, location: str) -> Optional[bool]:
+        """Resolve a location from the cache or patterns without any I/O - None if undecided"""
+        if not location:
+            return True
+        
+        # strip() hands back the same string when there's nothing to strip; lower()
+        # always copies, so only call it when the location isn't lowercase already
+        location_key = location.strip()
+        if not location_key:
+            return True
+        if not location_key.islower():
+            location_key = location_key.lower()
+        
+        # 1. Pattern matching (high confidence)
+        result = self._pattern_lookup(location_key)
+        if result is not None:
+            return result
+        
+        # 2. Check cache of geocoded locations
+        return self._cache.get(location_key)
+    
     def _pattern_match(self, location_lower: str) -> Optional[bool]:
-        """Fast pattern-based detection for common cases"""
+        """Fast pattern-based detection for common cases - expects a lowercased location"""
         
         # Check non-US patterns FIRST (higher priority)
-        for pattern in self.non_us_patterns:
-            if re.search(pattern, location_lower, re.IGNORECASE):
-                logger.debug(f"Location '{location_lower}' matched non-US pattern: {pattern}")
-                return False
+        match = self._non_us_regex.search(location_lower)
+        if match:
+            logger.debug("Location '%s' matched non-US pattern: %s", location_lower, match.group(0))
+            return False
         
         # Then check US patterns
-        for pattern in self.us_patterns:
-            if re.search(pattern, location_lower, re.IGNORECASE):
-                logger.debug(f"Location '{location_lower}' matched US pattern: {pattern}")
-                return True
+        match = self._us_regex.search(location_lower)
+        if match:
+            logger.debug("Location '%s' matched US pattern: %s", location_lower, match.group(0))
+            return True
         
         return None  # No pattern match
     
@@ -110,32 +278,26 @@ class LocationFilter:
             
             self._last_api_call = time.time()
             
-            # Use free Nominatim API (OpenStreetMap)
-            url = "https://nominatim.openstreetmap.org/search"
             params = {
                 'q': location,
                 'format': 'json',
                 'limit': 1,
                 'addressdetails': 1
             }
-            headers = {
-                'User-Agent': 'FastJobAgent/1.0 (https://github.com/shuai/fast-job-agent; job-scraper)',
-                'Accept': 'application/json',
-                'Accept-Language': 'en-US,en;q=0.9'
-            }
             
-            response = requests.get(url, params=params, headers=headers, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                
-                if data:
-                    address = data[0].get('address', {})
-                    country_code = address.get('country_code', '').upper()
+            # Non-blocking request on a pooled session - scrapers keep running meanwhile
+            async with self._get_session().get(GEOCODE_URL, params=params) as response:
+                if response.status == 200:
+                    data = json_loads(await response.read())
                     
-                    if country_code:
-                        is_us = country_code == 'US'
-                        logger.debug(f"Geocoded '{location}' -> {country_code} -> {'US' if is_us else 'non-US'}")
-                        return is_us
+                    if data:
+                        address = data[0].get('address', {})
+                        country_code = address.get('country_code', '').upper()
+                        
+                        if country_code:
+                            is_us = country_code == 'US'
+                            logger.debug(f"Geocoded '{location}' -> {country_code} -> {'US' if is_us else 'non-US'}")
+                            return is_us
                         
         except Exception as e:
             logger.debug(f"Geocoding failed for '{location}': {e}")
@@ -146,45 +308,49 @@ class LocationFilter:
         """Get cache statistics for debugging"""
         total = len(self._cache)
         us_count = sum(1 for is_us in self._cache.values() if is_us)
+        pattern_info = self._pattern_lookup.cache_info()
+        lookups = pattern_info.hits + pattern_info.misses
         
         return {
             'total_cached': total,
+            'geocoded': len(self._geocoded),
             'us_locations': us_count,
             'non_us_locations': total - us_count,
-            'cache_hit_rate': '%.1f%%' % (100.0 * total / max(total, 1))
+            'pattern_cached': pattern_info.currsize,
+            'cache_hit_rate': '%.1f%%' % (100.0 * pattern_info.hits / max(lookups, 1))
         }
 
 
 # Global instance
-_location_filter = LocationFilter()
+_location_filter = LocationFilter(cache_file=config.LOCATION_CACHE_FILE)
 
 async def is_us_location(location: str) -> bool:
     """Async convenience function for location filtering"""
     return await _location_filter.is_us_location(location)
 
+async def classify_us_locations(locations: List[str]) -> List[bool]:
+    """Async convenience function for batch location filtering"""
+    return await _location_filter.classify_locations(locations)
+
 def is_us_location_sync(location: str) -> bool:
     """Sync convenience function for location filtering (uses cache only for performance)"""
-    if not location or not location.strip():
-        return True
-        
-    location = location.strip()
-    location_key = location.lower()
-    
-    # 1. Check cache first
-    if location_key in _location_filter._cache:
-        return _location_filter._cache[location_key]
-    
-    # 2. Pattern matching (high confidence)
-    result = _location_filter._pattern_match(location_key)
+    result = _location_filter._resolve_fast(location)
     if result is not None:
-        _location_filter._cache[location_key] = result
         return result
     
+    location = location.strip()
+    location_key = location.lower()
+    
     # 3. Conservative fallback: filter out unknown locations
     logger.warning(f"Unknown location '{location}' (sync mode), filtering out for safety")
     _location_filter._cache[location_key] = False
     return False
 
+async def close_location_filter():
+    """Save the shared filter's geocoded locations and close its geocoding session"""
+    _location_filter.save_cache()
+    await _location_filter.close()
+
 def get_location_cache_stats() -> Dict[str, Any]:
     """Get location filter cache statistics"""
     return _location_filter.get_cache_stats()
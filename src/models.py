@@ -3,9 +3,11 @@
 Data models for Fast Job Agent
 """
 
+from collections import Counter
 from dataclasses import dataclass, field
 from typing import List, TypedDict
 from enum import Enum
+from constants import EmploymentTypeDefaults, CompensationDefaults
 
 
 class JobSource(Enum):
@@ -29,22 +31,70 @@ class JobDict(TypedDict):
     job_id: str
 
 
-@dataclass
+@dataclass(slots=True)
+class Job:
+    """A scraped job posting - slots keep each record far smaller than a 10-key dict"""
+    role_name: str
+    company_name: str
+    location: str = ''
+    job_link: str = ''
+    employment_type: str = EmploymentTypeDefaults.FULL_TIME
+    team: str = ''
+    published_date: str = ''
+    compensation: str = CompensationDefaults.NOT_DISCLOSED
+    source: str = ''
+    job_id: str = ''
+    
+    def to_dict(self) -> JobDict:
+        """Convert to the job dict used for export and Notion sync"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class GreenhouseLocation(TypedDict, total=False):
+    """Location object on a Greenhouse job"""
+    name: str
+
+
+class GreenhouseDepartment(TypedDict, total=False):
+    """Department object on a Greenhouse job"""
+    name: str
+
+
+class GreenhouseJob(TypedDict, total=False):
+    """Fields read from a Greenhouse board job - everything else is skipped when decoding"""
+    id: int
+    title: str
+    absolute_url: str
+    updated_at: str
+    location: GreenhouseLocation
+    departments: List[GreenhouseDepartment]
+
+
+class GreenhouseBoard(TypedDict, total=False):
+    """Greenhouse board API response"""
+    jobs: List[GreenhouseJob]
+
+
+class LeverCategories(TypedDict, total=False):
+    """Categories object on a Lever posting"""
+    location: str
+    commitment: str
+    team: str
+
+
+class LeverPosting(TypedDict, total=False):
+    """Fields read from a Lever posting - everything else is skipped when decoding"""
+    id: str
+    text: str
+    createdAt: int
+    categories: LeverCategories
+
+
+@dataclass(slots=True)
 class JobStats:
     """Statistics for job filtering"""
     total_jobs: int = 0
     us_jobs: int = 0
     non_us_jobs: int = 0
-    non_us_locations: List[str] = field(default_factory=list)
-    
-    def add_us_job(self):
-        """Increment US job count"""
-        self.us_jobs += 1
-        self.total_jobs += 1
-    
-    def add_non_us_job(self, location: str):
-        """Increment non-US job count and track location"""
-        self.non_us_jobs += 1
-        self.total_jobs += 1
-        if location:
-            self.non_us_locations.append(location)
\ No newline at end of file
+    # Location -> number of non-US jobs there - repeats collapse into one entry
+    non_us_locations: Counter = field(default_factory=Counter)
\ No newline at end of file
@@ -5,14 +5,18 @@ Sync job data to Notion database
 """
 
 import os
-import json
+import random
+import asyncio
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional, Set
-from notion_client import Client
+from typing import Any, Awaitable, Callable, List, Dict, Set
+from notion_client import AsyncClient, Client
+from notion_client.errors import HTTPResponseError, RequestTimeoutError
+from notion_client.helpers import async_iterate_paginated_api
 from dotenv import load_dotenv
 import config
+from utils import json_dumps, json_loads, run_async
 
 # Load environment variables
 load_dotenv()
@@ -29,9 +33,22 @@ class NotionSync:
             raise ValueError("NOTION_API_TOKEN and NOTION_DATABASE_ID must be set in .env file")
         
         self.client = Client(auth=self.notion_token)
+        # Event loop time the next Notion request may start, see _wait_for_request_slot
+        self._next_request_at = 0.0
+        # Select property -> option name -> option ID, refreshed at the start of each sync
+        self._select_option_ids: Dict[str, Dict[str, str]] = {}
         
         # Initialize incremental sync
         self.sync_cache_file = config.DATA_DIR / "synced_jobs.json"
+        # Job IDs synced since the last snapshot, one JSON line per sync - see _save_synced_jobs
+        self.sync_log_file = config.DATA_DIR / "synced_jobs.log"
+        # last_sync/total_synced as last read or written, so stats and cleanup don't re-read the file
+        self._cache_info: Dict = {}
+        # IDs added since the last save, IDs already in the log, and whether the log
+        # ends in a torn line that the next append would run into
+        self._pending_ids: List[str] = []
+        self._logged_count = 0
+        self._log_torn = False
         self.synced_jobs = self._load_synced_jobs()
         
     def _create_job_page(self, job: Dict) -> Dict:
@@ -41,7 +58,7 @@ class NotionSync:
                 "title": [{"text": {"content": job.get('role_name', '')}}]
             },
             "Company": {
-                "select": {"name": job.get('company_name', '')}
+                "select": self._select_option("Company", job.get('company_name', ''))
             },
             "Location": {
                 "rich_text": [{"text": {"content": job.get('location', '')}}]
@@ -50,7 +67,7 @@ class NotionSync:
                 "url": job.get('job_link', '')
             },
             "Employment Type": {
-                "select": {"name": job.get('employment_type', '')}
+                "select": self._select_option("Employment Type", job.get('employment_type', ''))
             },
             "Team": {
                 "rich_text": [{"text": {"content": job.get('team', '')}}]
@@ -66,8 +83,9 @@ class NotionSync:
         # Add published date if available
         if job.get('published_date'):
             try:
-                # Try to parse the date (format: YYYY-MM-DD)
-                pub_date = datetime.strptime(job['published_date'], '%Y-%m-%d')
+                # Try to parse the date (format: YYYY-MM-DD) - fromisoformat is a C parser,
+                # much cheaper than strptime's format matching
+                pub_date = datetime.fromisoformat(job['published_date'])
                 properties["Published Date"] = {
                     "date": {"start": pub_date.isoformat()}
                 }
@@ -77,39 +95,131 @@ class NotionSync:
         
         return properties
     
-    def _load_synced_jobs(self) -> Set[str]:
-        """Load the set of already synced job IDs from cache file"""
-        if not self.sync_cache_file.exists():
-            return set()
-        
+    def _select_option(self, property_name: str, name: str) -> Dict[str, str]:
+        """Reference a select option by ID when it's known, so Notion skips matching it by name"""
+        option_id = self._select_option_ids.get(property_name, {}).get(name)
+        if option_id:
+            return {"id": option_id}
+        return {"name": name}
+    
+    def _remember_select_options(self, properties: Dict) -> None:
+        """Record the option IDs of select values in a page or database response"""
+        for property_name, value in properties.items():
+            if value.get('type') != 'select':
+                continue
+            
+            option_ids = self._select_option_ids.setdefault(property_name, {})
+            select = value.get('select') or {}
+            # A database lists every option, a page holds its chosen one
+            for option in select.get('options', [select]):
+                if option.get('id') and option.get('name'):
+                    option_ids[option['name']] = option['id']
+    
+    async def _fetch_select_options(self, client: AsyncClient) -> None:
+        """Load the database's select option IDs - without them options are matched by name"""
+        self._select_option_ids = {}
         try:
-            with open(self.sync_cache_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return set(data.get('synced_job_ids', []))
+            database = await self._call_notion(client.databases.retrieve, database_id=self.database_id)
+            self._remember_select_options(database.get('properties', {}))
         except Exception as e:
-            logger.warning(f"Failed to load sync cache: {e}")
-            return set()
+            logger.warning(f"Failed to load Notion select options, matching by name: {e}")
+    
+    def _load_synced_jobs(self) -> Set[str]:
+        """Load the set of already synced job IDs from the cache snapshot and log"""
+        synced_jobs = set()
+        
+        if self.sync_cache_file.exists():
+            try:
+                data = json_loads(self.sync_cache_file.read_bytes())
+                self._cache_info = {
+                    'last_sync': data.get('last_sync', ''),
+                    'total_synced': data.get('total_synced', 0)
+                }
+                synced_jobs.update(data.get('synced_job_ids', []))
+            except Exception as e:
+                logger.warning(f"Failed to load sync cache: {e}")
+        
+        if self.sync_log_file.exists():
+            try:
+                for line in self.sync_log_file.read_bytes().splitlines():
+                    try:
+                        entry = json_loads(line)
+                    except ValueError:
+                        # Torn write from an interrupted run - those jobs get re-checked against Notion
+                        self._log_torn = True
+                        continue
+                    synced_jobs.update(entry.get('synced_job_ids', []))
+                    self._cache_info['last_sync'] = entry.get('last_sync', '')
+                    self._logged_count += max(len(entry.get('synced_job_ids', [])), 1)
+                self._cache_info['total_synced'] = len(synced_jobs)
+            except Exception as e:
+                logger.warning(f"Failed to load sync log: {e}")
+        
+        return synced_jobs
     
-    def _save_synced_jobs(self) -> None:
-        """Save the set of synced job IDs to cache file"""
+    def _mark_synced(self, unique_job_id: str) -> None:
+        """Add a job ID to the synced set, queueing it for the next save"""
+        if unique_job_id not in self.synced_jobs:
+            self.synced_jobs.add(unique_job_id)
+            self._pending_ids.append(unique_job_id)
+    
+    def _save_synced_jobs(self, compact: bool = False) -> None:
+        """
+        Save the synced job IDs added since the last save
+        
+        New IDs are appended to the log, so a sync writes only what it added rather
+        than the whole cache. Once the log reaches half the size of the snapshot it
+        is folded into a new snapshot.
+        
+        Args:
+            compact: Rewrite the snapshot now - needed after IDs were removed
+        """
         try:
             # Ensure directory exists
             self.sync_cache_file.parent.mkdir(parents=True, exist_ok=True)
             
-            data = {
-                'synced_job_ids': list(self.synced_jobs),
-                'last_sync': datetime.now().isoformat(),
-                'total_synced': len(self.synced_jobs)
-            }
+            last_sync = datetime.now().isoformat()
+            logged_count = self._logged_count + max(len(self._pending_ids), 1)
+            
+            if compact or self._log_torn or logged_count > len(self.synced_jobs) // 2:
+                self._write_snapshot(last_sync)
+            else:
+                entry = {'last_sync': last_sync}
+                if self._pending_ids:
+                    entry['synced_job_ids'] = self._pending_ids
+                with open(self.sync_log_file, 'ab') as f:
+                    f.write(json_dumps(entry) + b'\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._logged_count = logged_count
             
-            with open(self.sync_cache_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+            self._pending_ids = []
+            self._cache_info = {'last_sync': last_sync, 'total_synced': len(self.synced_jobs)}
                 
             logger.debug(f"Saved {len(self.synced_jobs)} synced job IDs to cache")
             
         except Exception as e:
             logger.error(f"Failed to save sync cache: {e}")
     
+    def _write_snapshot(self, last_sync: str) -> None:
+        """Atomically replace the snapshot with the full synced set and drop the log"""
+        data = {
+            'synced_job_ids': list(self.synced_jobs),
+            'last_sync': last_sync,
+            'total_synced': len(self.synced_jobs)
+        }
+        
+        # The log goes first: a crash before the replace loses only IDs that get
+        # re-checked against Notion, while a stale log would resurrect cleared IDs
+        self.sync_log_file.unlink(missing_ok=True)
+        self._logged_count = 0
+        self._log_torn = False
+        
+        # Compact - the file is only ever read back by this class
+        temp_file = self.sync_cache_file.with_name(self.sync_cache_file.name + '.tmp')
+        temp_file.write_bytes(json_dumps(data))
+        os.replace(temp_file, self.sync_cache_file)
+    
     def _generate_job_id(self, job: Dict) -> str:
         """Generate a unique job ID from job data"""
         source = job.get('source', 'unknown')
@@ -124,27 +234,129 @@ class NotionSync:
         
         return f"{source}_{job_id}"
     
-    def _job_exists(self, job_link: str) -> Optional[str]:
-        """Check if a job already exists in the database by job link"""
-        try:
-            response = self.client.databases.query(
-                database_id=self.database_id,
-                filter={
-                    "property": "Job Link",
-                    "url": {"equals": job_link}
-                }
-            )
+    async def _fetch_existing_links(self, client: AsyncClient, job_links: List[str]) -> Set[str]:
+        """
+        Find which of the given job links already have a page in the database
+        
+        Only the links being synced are looked up, in batches of one 'or' filter
+        per request, so the cost follows the number of new jobs rather than the
+        size of the database.
+        
+        Args:
+            client: Notion client
+            job_links: Links of the jobs about to be synced
             
-            if response['results']:
-                return response['results'][0]['id']
-            return None
+        Returns:
+            The subset of job_links found in Notion
+        """
+        async def query(**kwargs) -> Dict:
+            return await self._call_notion(client.databases.query, **kwargs)
+        
+        links = list(dict.fromkeys(filter(None, job_links)))
+        batch_size = config.NOTION_LINK_FILTER_BATCH
+        
+        existing_links = set()
+        for start in range(0, len(links), batch_size):
+            link_filter = {
+                "or": [
+                    {"property": "Job Link", "url": {"equals": link}}
+                    for link in links[start:start + batch_size]
+                ]
+            }
+            async for page in async_iterate_paginated_api(
+                query,
+                database_id=self.database_id,
+                filter=link_filter,
+                page_size=100
+            ):
+                job_link = page['properties'].get('Job Link', {}).get('url')
+                if job_link:
+                    existing_links.add(job_link)
+        
+        logger.debug("Fetched %d existing job links from Notion", len(existing_links))
+        return existing_links
+    
+    async def _wait_for_request_slot(self) -> None:
+        """
+        Wait until the next Notion request may start
+        
+        Notion allows an average of 3 requests per second per integration, so request
+        starts are spaced evenly instead of bursting and drawing 429s. Each caller
+        reserves its start time before sleeping, so concurrent callers queue up.
+        """
+        now = asyncio.get_running_loop().time()
+        start_at = max(now, self._next_request_at)
+        self._next_request_at = start_at + 1 / config.NOTION_REQUESTS_PER_SECOND
+        
+        if start_at > now:
+            await asyncio.sleep(start_at - now)
+    
+    async def _call_notion(self, method: Callable[..., Awaitable[Any]], *, idempotent: bool = True, **kwargs) -> Any:
+        """
+        Call a Notion API method within the rate limit, retrying throttled and failed requests
+        
+        A 429 pushes every caller's next request back by its Retry-After; a 5xx
+        (including gateway errors without Notion's JSON error body) or a timeout is
+        retried by this caller alone after an exponential, jittered delay.
+        
+        A request that timed out or failed with a 5xx may still have been applied, so
+        non-idempotent calls such as page creation are only retried on a 429.
+        
+        Args:
+            method: AsyncClient endpoint method, e.g. client.pages.create
+            idempotent: Whether the call is safe to repeat after a timeout or 5xx
+            **kwargs: Arguments for the method
             
-        except Exception as e:
-            logger.error(f"Error checking if job exists: {e}")
-            return None
+        Returns:
+            The method's response
+        """
+        for attempt in range(config.NOTION_MAX_RETRIES + 1):
+            await self._wait_for_request_slot()
+            try:
+                return await method(**kwargs)
+            except RequestTimeoutError:
+                if attempt == config.NOTION_MAX_RETRIES or not idempotent:
+                    raise
+                delay = 2 ** attempt + random.random()
+                logger.warning("Notion API request timed out, retrying in %.1fs", delay)
+                await asyncio.sleep(delay)
+            except HTTPResponseError as e:
+                if attempt == config.NOTION_MAX_RETRIES or not (e.status == 429 or (idempotent and e.status >= 500)):
+                    raise
+                
+                if e.status == 429:
+                    try:
+                        delay = float(e.headers.get('Retry-After', 1))
+                    except ValueError:
+                        delay = 1.0
+                else:
+                    delay = 2 ** attempt + random.random()
+                logger.warning("Notion API returned %d, retrying in %.1fs", e.status, delay)
+                
+                if e.status == 429:
+                    now = asyncio.get_running_loop().time()
+                    self._next_request_at = max(self._next_request_at, now + delay)
+                else:
+                    await asyncio.sleep(delay)
     
     def sync_jobs(self, jobs: List[Dict]) -> Dict:
         """Sync jobs to Notion database using incremental updates"""
+        return run_async(self.sync_jobs_async(jobs))
+    
+    async def sync_jobs_async(self, jobs: List[Dict], concurrency: int = config.NOTION_MAX_CONCURRENT) -> Dict:
+        """
+        Sync jobs to Notion database using incremental updates
+        
+        The new jobs' links are looked up in Notion in batches up front, so each new
+        job costs only its page create - and up to `concurrency` creates are in flight at once.
+        
+        Args:
+            jobs: Job dicts to sync
+            concurrency: Maximum number of jobs talking to the Notion API at once
+            
+        Returns:
+            Sync statistics
+        """
         stats = {
             'total': len(jobs),
             'new': 0,
@@ -153,58 +365,35 @@ class NotionSync:
             'errors': 0
         }
         
-        # Filter out jobs that are already synced (from local cache)
+        # Filter out jobs that are already synced (from local cache), keeping each
+        # new job's ID so it isn't generated again when the job is marked synced
         new_jobs = []
         for job in jobs:
             unique_job_id = self._generate_job_id(job)
             
             if unique_job_id in self.synced_jobs:
                 stats['cached_skip'] += 1
-                logger.debug(f"Skipping cached job: {job.get('role_name', '')} at {job.get('company_name', '')}")
+                logger.debug("Skipping cached job: %s at %s", job.get('role_name', ''), job.get('company_name', ''))
             else:
-                new_jobs.append(job)
+                new_jobs.append((unique_job_id, job))
         
         logger.info(f"📊 Sync Stats: {len(jobs)} total jobs, {len(new_jobs)} new jobs to check, {stats['cached_skip']} cached skips")
         
-        # Process only new jobs
-        for job in new_jobs:
-            try:
-                job_link = job.get('job_link', '')
-                unique_job_id = self._generate_job_id(job)
-                
-                if not job_link:
-                    logger.warning("Job has no link, skipping")
-                    stats['errors'] += 1
-                    continue
-                
-                # Double-check with Notion API (in case cache is outdated)
-                existing_id = self._job_exists(job_link)
-                
-                if existing_id:
-                    logger.info(f"Job already exists in Notion: {job.get('role_name', '')} at {job.get('company_name', '')}")
-                    stats['existing'] += 1
-                    # Add to cache to avoid future API calls
-                    self.synced_jobs.add(unique_job_id)
-                else:
-                    # Create new job page
-                    properties = self._create_job_page(job)
-                    
-                    self.client.pages.create(
-                        parent={"database_id": self.database_id},
-                        properties=properties
-                    )
-                    
-                    logger.info(f"✅ Created new job: {job.get('role_name', '')} at {job.get('company_name', '')}")
-                    stats['new'] += 1
-                    
-                    # Add to synced cache
-                    self.synced_jobs.add(unique_job_id)
-                    
-            except Exception as e:
-                logger.error(f"Error syncing job {job.get('role_name', '')}: {e}")
-                stats['errors'] += 1
+        # Process only new jobs, checked against Notion in case the cache is outdated
+        if new_jobs:
+            slots = asyncio.Semaphore(concurrency)
+            async with AsyncClient(auth=self.notion_token) as client:
+                existing_links = await self._fetch_existing_links(
+                    client, [job.get('job_link', '') for _, job in new_jobs]
+                )
+                await self._fetch_select_options(client)
+                await asyncio.gather(*(
+                    self._sync_job(client, slots, job, unique_job_id, existing_links, stats)
+                    for unique_job_id, job in new_jobs
+                ))
         
-        # Save updated cache
+        # Save updated cache - a sync that added nothing only appends its last_sync,
+        # which cleanup_old_cache reads to tell a live cache from an abandoned one
         self._save_synced_jobs()
         
         # Log final stats
@@ -212,6 +401,50 @@ class NotionSync:
         
         return stats
     
+    async def _sync_job(self, client: AsyncClient, slots: asyncio.Semaphore, job: Dict,
+                        unique_job_id: str, existing_links: Set[str], stats: Dict) -> None:
+        """Create one job's page unless Notion already has its link, counting the outcome in stats"""
+        job_link = job.get('job_link', '')
+        if not job_link:
+            logger.warning("Job has no link, skipping")
+            stats['errors'] += 1
+            return
+        
+        if job_link in existing_links:
+            logger.info("Job already exists in Notion: %s at %s", job.get('role_name', ''), job.get('company_name', ''))
+            stats['existing'] += 1
+            # Add to cache to avoid future API calls
+            self._mark_synced(unique_job_id)
+            return
+        
+        # Claim the link so a duplicate later in this run counts as existing
+        existing_links.add(job_link)
+        
+        async with slots:
+            try:
+                # Create new job page
+                properties = self._create_job_page(job)
+                
+                page = await self._call_notion(
+                    client.pages.create,
+                    idempotent=False,
+                    parent={"database_id": self.database_id},
+                    properties=properties
+                )
+                # Options created by name just now get their IDs for the rest of the run
+                self._remember_select_options(page.get('properties', {}))
+                
+                logger.info("✅ Created new job: %s at %s", job.get('role_name', ''), job.get('company_name', ''))
+                stats['new'] += 1
+                
+                # Add to synced cache
+                self._mark_synced(unique_job_id)
+                
+            except Exception as e:
+                existing_links.discard(job_link)
+                logger.error(f"Error syncing job {job.get('role_name', '')}: {e}")
+                stats['errors'] += 1
+    
     def clear_all_cache(self) -> int:
         """
         Clear all cached job IDs - useful when Notion database is recreated
@@ -220,7 +453,7 @@ class NotionSync:
         try:
             old_count = len(self.synced_jobs)
             self.synced_jobs.clear()
-            self._save_synced_jobs()
+            self._save_synced_jobs(compact=True)
             
             logger.info(f"🧹 Cleared all cache: removed {old_count} job IDs")
             return old_count
@@ -239,10 +472,7 @@ class NotionSync:
             return 0
         
         try:
-            with open(self.sync_cache_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            last_sync_str = data.get('last_sync', '')
+            last_sync_str = self._cache_info.get('last_sync', '')
             if not last_sync_str:
                 return 0
             
@@ -253,7 +483,7 @@ class NotionSync:
                 # Cache is old, clear it
                 old_count = len(self.synced_jobs)
                 self.synced_jobs.clear()
-                self._save_synced_jobs()
+                self._save_synced_jobs(compact=True)
                 
                 logger.info(f"🧹 Cleaned up old cache: removed {old_count} job IDs older than {days_threshold} days")
                 return old_count
@@ -271,14 +501,9 @@ class NotionSync:
             'cache_file_exists': self.sync_cache_file.exists()
         }
         
-        if self.sync_cache_file.exists():
-            try:
-                with open(self.sync_cache_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                stats['last_sync'] = data.get('last_sync', 'Unknown')
-                stats['total_synced'] = data.get('total_synced', 0)
-            except Exception:
-                pass
+        if stats['cache_file_exists']:
+            stats['last_sync'] = self._cache_info.get('last_sync', 'Unknown')
+            stats['total_synced'] = self._cache_info.get('total_synced', 0)
         
         return stats
     
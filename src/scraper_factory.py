@@ -3,7 +3,7 @@
 Simplified Scraper Factory for Fast Job Agent
 """
 
-from typing import Dict, Type, List
+from typing import Type, List
 from models import JobSource
 from base_scraper import AsyncBaseScraper
 from ashby_scraper import AsyncAshbyScraper
@@ -2,15 +2,24 @@
 Utils package for Fast Job Agent
 """
 
-from .date_utils import parse_date, timestamp_to_date
-from .logging_utils import log_job_statistics, setup_logger, log_scraper_start
+from .date_utils import parse_date, timestamp_to_date, epoch_ms_to_date, months_ago
+from .logging_utils import log_job_statistics, setup_logger, log_scraper_start, queued_file_handler
 from .decorators import with_error_handling
+from .json_utils import json_loads, json_dumps, make_json_decoder
+from .async_utils import run_async
 
 __all__ = [
     'parse_date',
     'timestamp_to_date',
+    'epoch_ms_to_date',
+    'months_ago',
     'log_job_statistics',
     'setup_logger',
     'log_scraper_start',
-    'with_error_handling'
+    'queued_file_handler',
+    'with_error_handling',
+    'json_loads',
+    'json_dumps',
+    'make_json_decoder',
+    'run_async'
 ]
\ No newline at end of file
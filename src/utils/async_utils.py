@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Async utility functions
+"""
+
+import asyncio
+from typing import Any, Coroutine
+
+
+def run_async(main: Coroutine) -> Any:
+    """
+    Run a coroutine to completion, on uvloop when it is installed
+    
+    uvloop is a libuv-backed drop-in event loop that roughly halves per-request
+    overhead for aiohttp workloads. Falls back to the default asyncio loop.
+    The loop is passed to asyncio.Runner (Python 3.11+) rather than installed
+    as a global policy.
+    
+    Args:
+        main: Coroutine to run
+        
+    Returns:
+        Result of the coroutine
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(main)
+    
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+        return runner.run(main)
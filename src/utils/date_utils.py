@@ -3,12 +3,33 @@
 Date utility functions
 """
 
+import calendar
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Every UTC offset and DST switch falls on a quarter hour, so all timestamps in the same
+# epoch-aligned quarter hour have the same local date
+MS_PER_QUARTER_HOUR = 900_000
+
+
+# Common date formats to try
+DATE_FORMATS = (
+    '%Y-%m-%d',           # 2025-07-10
+    '%Y-%m-%dT%H:%M:%S',  # 2025-07-10T15:30:00
+    '%Y-%m-%d %H:%M:%S',  # 2025-07-10 15:30:00
+    '%m/%d/%Y',           # 07/10/2025
+    '%d/%m/%Y',           # 10/07/2025
+    '%Y-%m-%dT%H:%M:%SZ', # ISO format with Z
+    '%Y-%m-%dT%H:%M:%S.%fZ', # ISO format with milliseconds
+)
+
+# Date-only part of each format, for retrying a string with its time cut off
+DATE_ONLY_FORMATS = tuple(fmt.partition('T')[0].partition(' ')[0] for fmt in DATE_FORMATS)
+
 
 def parse_date(date_str: str) -> Optional[datetime]:
     """
@@ -23,31 +44,39 @@ def parse_date(date_str: str) -> Optional[datetime]:
     if not date_str or not date_str.strip():
         return None
     
-    # Common date formats to try
-    date_formats = [
-        '%Y-%m-%d',           # 2025-07-10
-        '%Y-%m-%dT%H:%M:%S',  # 2025-07-10T15:30:00
-        '%Y-%m-%d %H:%M:%S',  # 2025-07-10 15:30:00
-        '%m/%d/%Y',           # 07/10/2025
-        '%d/%m/%Y',           # 10/07/2025
-        '%Y-%m-%dT%H:%M:%SZ', # ISO format with Z
-        '%Y-%m-%dT%H:%M:%S.%fZ', # ISO format with milliseconds
-    ]
+    return _parse_date(date_str)
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(date_str: str) -> Optional[datetime]:
+    """
+    Try ISO-8601 first, then each format in order
+    
+    The order is fixed so a string always parses the same way - 07/10/2025 is
+    July 10 however many day-first dates came before it.
+    """
+    # Nearly every feed sends ISO-8601, which fromisoformat parses in C - several
+    # times faster than even the first strptime. Offsets are dropped to keep the
+    # wall-clock time, the same as the '...Z' formats below
+    try:
+        return datetime.fromisoformat(date_str).replace(tzinfo=None)
+    except ValueError:
+        pass
     
     # Clean the date string (remove timezone info after parsing)
-    clean_date_str = date_str.split('T')[0] if 'T' in date_str else date_str
+    clean_date_str = date_str.partition('T')[0]
     
-    for fmt in date_formats:
+    for fmt, date_only_fmt in zip(DATE_FORMATS, DATE_ONLY_FORMATS):
         try:
             return datetime.strptime(date_str, fmt)
         except ValueError:
             try:
                 # Try with just the date part
-                return datetime.strptime(clean_date_str, fmt.split('T')[0].split(' ')[0])
+                return datetime.strptime(clean_date_str, date_only_fmt)
             except ValueError:
                 continue
     
-    logger.debug(f"Could not parse date: {date_str}")
+    logger.debug("Could not parse date: %s", date_str)
     return None
 
 
@@ -63,12 +92,61 @@ def timestamp_to_date(timestamp: int, divisor: int = 1000) -> str:
         Date string in YYYY-MM-DD format
     """
     try:
-        return datetime.fromtimestamp(timestamp / divisor).strftime('%Y-%m-%d')
+        # date.isoformat() formats YYYY-MM-DD directly, without strftime's locale machinery
+        return datetime.fromtimestamp(timestamp / divisor).date().isoformat()
     except (ValueError, OSError, TypeError):
-        logger.debug(f"Could not convert timestamp: {timestamp}")
+        logger.debug("Could not convert timestamp: %s", timestamp)
         return ""
 
 
+@lru_cache(maxsize=4096)
+def _quarter_hour_to_date(quarter_hour: int) -> str:
+    """Format a quarter-hour count since the Unix epoch as a local YYYY-MM-DD date"""
+    return datetime.fromtimestamp(quarter_hour * 900).date().isoformat()
+
+
+def epoch_ms_to_date(timestamp_ms: int) -> str:
+    """
+    Convert millisecond Unix timestamp to local date string
+    
+    Same result as timestamp_to_date, but job posts cluster on a few recent
+    days, so results are cached per quarter hour and most calls skip datetime
+    construction entirely.
+    
+    Args:
+        timestamp_ms: Unix timestamp in milliseconds
+        
+    Returns:
+        Date string in YYYY-MM-DD format
+    """
+    try:
+        return _quarter_hour_to_date(int(timestamp_ms) // MS_PER_QUARTER_HOUR)
+    except (ValueError, OverflowError, OSError, TypeError):
+        logger.debug("Could not convert timestamp: %s", timestamp_ms)
+        return ""
+
+
+def months_ago(moment: datetime, months: int) -> datetime:
+    """
+    Step back a whole number of calendar months
+    
+    The day is clamped to the length of the target month, so 31 March minus
+    one month is 28/29 February rather than an invalid date.
+    
+    Args:
+        moment: Starting datetime
+        months: Number of months to go back
+        
+    Returns:
+        datetime the given number of months earlier
+    """
+    month_index = moment.year * 12 + moment.month - 1 - months
+    year, month = divmod(month_index, 12)
+    month += 1
+    day = min(moment.day, calendar.monthrange(year, month)[1])
+    return moment.replace(year=year, month=month, day=day)
+
+
 def is_recent_job(date_str: str, days: int = 365) -> bool:
     """
     Check if job is recent (within specified days)
@@ -25,22 +25,28 @@ def with_error_handling(
         reraise: Whether to reraise exceptions
     """
     def decorator(func: Callable) -> Callable:
-        @functools.wraps(func)
-        async def async_wrapper(*args, **kwargs):
-            try:
-                return await func(*args, **kwargs)
-            except asyncio.TimeoutError:
-                if log_errors:
-                    logger.error(f"Timeout in {func.__name__}")
-                if reraise:
-                    raise
-                return default_return
-            except Exception as e:
-                if log_errors:
-                    logger.error(f"Error in {func.__name__}: {e}")
-                if reraise:
-                    raise
-                return default_return
+        # Picked once here, so a call pays only for its own wrapper - and try blocks
+        # cost nothing until something raises
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                try:
+                    return await func(*args, **kwargs)
+                except asyncio.TimeoutError:
+                    if log_errors:
+                        logger.error("Timeout in %s", func.__name__)
+                    if reraise:
+                        raise
+                    return default_return
+                # CancelledError is a BaseException, so cancellation still propagates
+                except Exception as e:
+                    if log_errors:
+                        logger.error("Error in %s: %s", func.__name__, e)
+                    if reraise:
+                        raise
+                    return default_return
+            
+            return async_wrapper
         
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
@@ -48,15 +54,11 @@ def with_error_handling(
                 return func(*args, **kwargs)
             except Exception as e:
                 if log_errors:
-                    logger.error(f"Error in {func.__name__}: {e}")
+                    logger.error("Error in %s: %s", func.__name__, e)
                 if reraise:
                     raise
                 return default_return
         
-        # Return appropriate wrapper based on function type
-        if asyncio.iscoroutinefunction(func):
-            return async_wrapper
-        else:
-            return sync_wrapper
+        return sync_wrapper
     
-    return decorator
+    return decorator
\ No newline at end of file
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+JSON utility functions
+"""
+
+import json
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+# Parse JSON from str or bytes - orjson is 2-3x faster than stdlib json on
+# large payloads, fall back to stdlib when it isn't installed
+json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def json_dumps(data: Any, indent: bool = False) -> bytes:
+    """
+    Serialize data to UTF-8 JSON bytes, with orjson when it is installed
+    
+    Args:
+        data: JSON-serializable data
+        indent: Pretty-print with two-space indentation
+        
+    Returns:
+        Encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else None)
+    
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def make_json_decoder(schema: Any) -> Callable[[bytes], Any]:
+    """
+    Build a decoder for JSON payloads of a known shape
+    
+    With msgspec installed the payload is decoded straight into the schema
+    (TypedDicts, lists), skipping fields the schema doesn't name. Otherwise,
+    or if a payload doesn't fit the schema, it falls back to json_loads.
+    """
+    if msgspec is None:
+        return json_loads
+    
+    decoder = msgspec.json.Decoder(schema)
+    
+    def decode(raw: bytes) -> Any:
+        try:
+            return decoder.decode(raw)
+        except msgspec.ValidationError:
+            # Payload drifted from the schema - parse it untyped
+            return json_loads(raw)
+    
+    return decode
\ No newline at end of file
@@ -3,8 +3,12 @@
 Logging utility functions
 """
 
+import atexit
 import logging
-from typing import List, Dict
+import queue
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from typing import Tuple
 from pathlib import Path
 import sys
 from pathlib import Path
@@ -22,10 +26,57 @@ EMOJI_ERROR = "❌"
 EMOJI_WARNING = "⚠️"
 
 
+@lru_cache(maxsize=None)
+def queued_file_handler() -> logging.Handler:
+    """
+    Handler that writes to config.LOG_FILE from a background thread
+    
+    Logging calls only put the record on a queue, so disk writes never stall
+    the event loop while scrapers run. Queued records are flushed at
+    interpreter exit.
+    
+    Returns:
+        Handler shared by every caller
+    """
+    file_handler = logging.FileHandler(config.LOG_FILE, encoding='utf-8')
+    file_handler.setFormatter(logging.Formatter(config.LOG_FORMAT))
+    
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, file_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    queue_handler = QueueHandler(log_queue)
+    # Message only - the file handler adds the timestamp and level. Set explicitly so
+    # logging.basicConfig(format=...) doesn't format records twice
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    return queue_handler
+
+
+@lru_cache(maxsize=None)
+def _shared_handlers() -> Tuple[logging.Handler, logging.Handler]:
+    """
+    Create the console and file handlers every setup_logger logger shares
+    
+    Built on first use so importing utils doesn't open the log file, and shared
+    so the log file is opened once rather than once per logger.
+    
+    Returns:
+        Tuple of (console handler, file handler)
+    """
+    # Console handler
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter(config.LOG_FORMAT))
+    
+    return console_handler, queued_file_handler()
+
+
 def setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
     """
     Setup logger with consistent formatting
     
+    Safe to call repeatedly for the same name - handlers are only attached once.
+    
     Args:
         name: Logger name
         level: Logging level
@@ -36,21 +87,14 @@ def setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
     logger = logging.getLogger(name)
     logger.setLevel(level)
     
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(level)
-    console_formatter = logging.Formatter(config.LOG_FORMAT)
-    console_handler.setFormatter(console_formatter)
+    if logger.handlers:
+        return logger
     
-    # File handler
-    file_handler = logging.FileHandler(config.LOG_FILE)
-    file_handler.setLevel(logging.DEBUG)
-    file_formatter = logging.Formatter(config.LOG_FORMAT)
-    file_handler.setFormatter(file_formatter)
+    for handler in _shared_handlers():
+        logger.addHandler(handler)
     
-    # Add handlers
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    # The handlers above already write every record - don't repeat it through the root logger
+    logger.propagate = False
     
     return logger
 
@@ -64,13 +108,18 @@ def log_job_statistics(company_name: str, stats: JobStats, logger: logging.Logge
         stats: JobStats object with statistics
         logger: Logger instance to use
     """
+    # Skip building the messages (and the location join) when INFO is filtered out
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
     logger.info(f"{EMOJI_STATS} {company_name} Statistics:")
     logger.info(f"  Total jobs scraped: {stats.total_jobs}")
     logger.info(f"  US jobs: {stats.us_jobs}")
     logger.info(f"  Non-US jobs: {stats.non_us_jobs}")
     
     if stats.non_us_locations:
-        logger.info(f"  Non-US locations: {', '.join(stats.non_us_locations)}")
+        locations = (location if count == 1 else f"{location} (x{count})" for location, count in stats.non_us_locations.items())
+        logger.info(f"  Non-US locations: {', '.join(locations)}")
 
 
 def log_scraper_start(company_name: str, scraper_type: str, logger: logging.Logger) -> None:
@@ -82,7 +131,7 @@ def log_scraper_start(company_name: str, scraper_type: str, logger: logging.Logg
         scraper_type: Type of scraper (Ashby, Greenhouse, etc.)
         logger: Logger instance to use
     """
-    logger.info(f"{EMOJI_SEARCH} Starting async {scraper_type} scrape of {company_name}...")
+    logger.info("%s Starting async %s scrape of %s...", EMOJI_SEARCH, scraper_type, company_name)
 
 
 def log_scraper_summary(total_jobs: int, source: str, logger: logging.Logger) -> None:
@@ -95,6 +144,6 @@ def log_scraper_summary(total_jobs: int, source: str, logger: logging.Logger) ->
         logger: Logger instance to use
     """
     if total_jobs > 0:
-        logger.info(f"{EMOJI_SUCCESS} Found {total_jobs} {source} FDE jobs")
+        logger.info("%s Found %d %s FDE jobs", EMOJI_SUCCESS, total_jobs, source)
     else:
-        logger.info(f"{EMOJI_ERROR} No {source} FDE jobs found")
\ No newline at end of file
+        logger.info("%s No %s FDE jobs found", EMOJI_ERROR, source)
\ No newline at end of file
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+YAML Config Cache
+Process-wide cache of parsed YAML files, validated by file mtime and size
+"""
+
+import os
+import logging
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+MAX_CACHED_FILES = 100
+
+# Absolute path -> (st_mtime_ns, st_size, parsed data), least recently used first
+_cache: "OrderedDict[str, Tuple[int, int, Any]]" = OrderedDict()
+
+
+@lru_cache(maxsize=None)
+def _yaml_parser():
+    """
+    Import yaml on first parse - it's a heavy import that cache hits never need
+    
+    Returns:
+        Tuple of (yaml module, safe loader class)
+    """
+    import yaml
+    
+    try:
+        # libyaml's C parser - several times faster than the pure-Python loader
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:
+        from yaml import SafeLoader
+    
+    return yaml, SafeLoader
+
+
+def load_yaml(path: Union[str, Path]) -> Any:
+    """
+    Load a YAML file, returning the cached parse if the file is unchanged
+
+    The returned data is shared between callers and must be treated as
+    read-only - it is not copied on a cache hit.
+
+    Args:
+        path: Path to the YAML file
+
+    Returns:
+        Parsed YAML data
+    """
+    key = os.path.abspath(path)
+    stat = os.stat(key)
+
+    cached = _cache.get(key)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        _cache.move_to_end(key)
+        return cached[2]
+
+    yaml, safe_loader = _yaml_parser()
+    with open(key, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=safe_loader)
+
+    _cache[key] = (stat.st_mtime_ns, stat.st_size, data)
+    _cache.move_to_end(key)
+    if len(_cache) > MAX_CACHED_FILES:
+        _cache.popitem(last=False)
+
+    logger.debug(f"Loaded YAML config: {key}")
+    return data